@@ -0,0 +1,291 @@
+"""
+Append-only change history for missions and experiments.
+
+Routes call ``record`` with a field diff after each write. Records are
+buffered in memory and appended to the change_history table with
+multi-row INSERTs by a background worker, so recording a change adds no
+database round trip to the request. Bulk imports (api.importer) are not
+recorded.
+
+The buffer is bounded by AUDIT_MAX_BUFFER; records beyond it are dropped.
+A batch that fails AUDIT_MAX_ATTEMPTS times in a row (for example because
+the change_history migration has not been applied) is dropped too, so
+one bad batch cannot block every later record. Both are counted as
+``dropped`` in the stats.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from api.database import execute_query
+
+# Audit configuration
+FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+MAX_BUFFER = int(os.getenv("AUDIT_MAX_BUFFER") or 10000)
+MAX_ATTEMPTS = int(os.getenv("AUDIT_MAX_ATTEMPTS") or 5)
+RETENTION_DAYS = float(os.getenv("HISTORY_RETENTION_DAYS") or 0)
+PURGE_INTERVAL = float(os.getenv("HISTORY_PURGE_INTERVAL") or 3600)
+
+# Rows deleted per statement when purging, to keep lock times short
+PURGE_BATCH_SIZE = 5000
+
+_buffer = []
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+_stats = {"recorded": 0, "written": 0, "batches": 0, "errors": 0, "dropped": 0, "purged": 0}
+# Consecutive failed attempts to write the batch at the head of the buffer
+_attempts = 0
+
+
+def diff(old: Optional[dict], new: Optional[dict]) -> dict:
+    """
+    Compute a compact field diff.
+
+    Args:
+        old: Previous column values (None for a create)
+        new: New column values (None for a delete); keys missing here are unchanged
+
+    Returns:
+        dict: {field: [old, new]} for every field whose value changed
+    """
+    old = old or {}
+    if new is None:
+        return {field: [value, None] for field, value in old.items()}
+
+    return {
+        field: [old.get(field), value]
+        for field, value in new.items()
+        if old.get(field) != value
+    }
+
+
+def record(entity: str, entity_id: int, action: str, crew_id: Optional[int], changes: dict):
+    """
+    Queue a change record.
+
+    Args:
+        entity: "mission" or "experiment"
+        entity_id: ID of the changed row
+        action: "create", "update" or "delete"
+        crew_id: Crew member assigned to the row after the change
+        changes: Field diff from ``diff``
+    """
+    if not changes:
+        return
+
+    changed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    entry = (entity, entity_id, action, crew_id, json.dumps(changes, default=str), changed_at)
+
+    with _lock:
+        if len(_buffer) >= MAX_BUFFER:
+            _stats["dropped"] += 1
+            return
+        _buffer.append(entry)
+        _stats["recorded"] += 1
+        backlog = len(_buffer)
+
+    _ensure_worker()
+
+    if backlog >= BATCH_SIZE:
+        _wakeup.set()
+
+
+def flush():
+    """
+    Write buffered change records to the database.
+
+    Returns:
+        int: Number of records written
+    """
+    global _attempts
+
+    written = 0
+
+    while True:
+        with _lock:
+            batch = _buffer[:BATCH_SIZE]
+            del _buffer[:BATCH_SIZE]
+
+        if not batch:
+            return written
+
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(batch))
+        query = f"""
+            INSERT INTO change_history (entity, entity_id, action, crew_id, changes, changed_at)
+            VALUES {placeholders}
+        """
+        params = tuple(value for entry in batch for value in entry)
+
+        try:
+            # Row counts vary, so keep these out of the prepared statement cache
+            execute_query(query, params, fetch="none", prepare=False)
+        except Exception as e:
+            with _lock:
+                _stats["errors"] += 1
+                _attempts += 1
+                if _attempts >= MAX_ATTEMPTS:
+                    # Give up on this batch so later records are not blocked
+                    _attempts = 0
+                    _stats["dropped"] += len(batch)
+                    print(f"Dropping {len(batch)} change history records after {MAX_ATTEMPTS} failed attempts: {e}")
+                    continue
+                # Put the batch back so it is retried on the next flush
+                _buffer[:0] = batch
+            print(f"Error writing change history: {e}")
+            return written
+
+        with _lock:
+            _attempts = 0
+            _stats["written"] += len(batch)
+            _stats["batches"] += 1
+
+        written += len(batch)
+
+
+def get_history(
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100
+) -> list:
+    """
+    Read change records, newest first.
+
+    Buffered records are flushed first so callers see their own writes.
+
+    Args:
+        entity: Filter by entity type
+        entity_id: Filter by row ID (requires entity)
+        since: Only changes at or after this time (UTC)
+        until: Only changes before this time (UTC)
+        limit: Maximum number of records
+
+    Returns:
+        list: Change record dictionaries
+    """
+    flush()
+
+    conditions = []
+    params = []
+
+    if entity is not None:
+        conditions.append("entity = %s")
+        params.append(entity)
+    if entity_id is not None:
+        conditions.append("entity_id = %s")
+        params.append(entity_id)
+    if since is not None:
+        conditions.append("changed_at >= %s")
+        params.append(_to_utc(since))
+    if until is not None:
+        conditions.append("changed_at < %s")
+        params.append(_to_utc(until))
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit)
+
+    query = f"""
+        SELECT change_id, entity, entity_id, action, crew_id, changes, changed_at
+        FROM change_history
+        {where}
+        ORDER BY changed_at DESC, change_id DESC
+        LIMIT %s
+    """
+
+    rows = execute_query(query, tuple(params), fetch="all")
+
+    for row in rows:
+        if isinstance(row["changes"], (str, bytes, bytearray)):
+            row["changes"] = json.loads(row["changes"])
+
+    return rows
+
+
+def purge_expired() -> int:
+    """
+    Delete change records older than HISTORY_RETENTION_DAYS.
+
+    Rows are deleted in batches of PURGE_BATCH_SIZE using the
+    changed_at index. Does nothing when retention is not configured.
+
+    Returns:
+        int: Number of records deleted
+    """
+    if RETENTION_DAYS <= 0:
+        return 0
+
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=RETENTION_DAYS)
+    deleted = 0
+
+    while True:
+        count = execute_query(
+            "DELETE FROM change_history WHERE changed_at < %s ORDER BY changed_at LIMIT %s",
+            (cutoff, PURGE_BATCH_SIZE),
+            fetch="rowcount"
+        )
+        deleted += count
+        if count < PURGE_BATCH_SIZE:
+            break
+
+    with _lock:
+        _stats["purged"] += deleted
+
+    return deleted
+
+
+def get_stats() -> dict:
+    """
+    Get change history buffer statistics.
+
+    Returns:
+        dict: Counters and current backlog
+    """
+    with _lock:
+        return {**_stats, "pending": len(_buffer)}
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC (naive values are assumed UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _run():
+    """Background worker loop: flush on interval or when the batch is full."""
+    while not _stop.is_set():
+        _wakeup.wait(FLUSH_INTERVAL)
+        _wakeup.clear()
+        flush()
+
+
+def _ensure_worker():
+    """Start the background flush worker if it is not running."""
+    global _worker
+
+    if _worker is not None and _worker.is_alive():
+        return
+
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _stop.clear()
+            _worker = threading.Thread(target=_run, name="audit-writer", daemon=True)
+            _worker.start()
+
+
+def shutdown():
+    """Stop the background worker and flush any remaining records."""
+    _stop.set()
+    _wakeup.set()
+
+    if _worker is not None:
+        _worker.join(timeout=FLUSH_INTERVAL + 5)
+
+    flush()
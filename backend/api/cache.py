@@ -0,0 +1,114 @@
+"""
+Version-token response cache.
+
+Each table has a version counter that is bumped on every write. Cached
+entries are keyed by the version token of the tables they were built
+from, so a write makes stale entries unreachable without having to track
+which keys depend on which rows.
+
+Version counters only exist in the current process, so a write handled
+by another worker (run_prod.py) or serverless instance does not
+invalidate entries here. Every entry therefore also expires after
+CACHE_TTL_SECONDS, which bounds how stale a value from another process's
+write can be. A TTL of 0 disables the cache.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+# Cache configuration
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS") or 5)
+
+_versions = {"crew": 0, "mission": 0, "experiment": 0}
+_entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+
+def bump_version(*tables: str):
+    """
+    Mark one or more tables as changed.
+
+    Args:
+        tables: Names of the tables that were written to
+    """
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+def version_token(*tables: str) -> tuple:
+    """
+    Get the current version token for a set of tables.
+
+    Args:
+        tables: Names of the tables a cached value depends on
+
+    Returns:
+        tuple: Version token
+    """
+    with _lock:
+        return tuple(_versions.get(table, 0) for table in tables)
+
+
+def get(key: Hashable) -> Optional[Any]:
+    """
+    Look up a cached value.
+
+    Args:
+        key: Cache key (should include a version token)
+
+    Returns:
+        Cached value or None (also once the entry is older than CACHE_TTL_SECONDS)
+    """
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.monotonic() < expires_at:
+                _entries.move_to_end(key)
+                _stats["hits"] += 1
+                return value
+            del _entries[key]
+            _stats["expired"] += 1
+        _stats["misses"] += 1
+        return None
+
+
+def put(key: Hashable, value: Any):
+    """
+    Store a value in the cache, evicting the least recently used entry.
+
+    Args:
+        key: Cache key (should include a version token)
+        value: Value to cache
+    """
+    if CACHE_TTL_SECONDS <= 0:
+        return
+
+    with _lock:
+        _entries[key] = (time.monotonic() + CACHE_TTL_SECONDS, value)
+        _entries.move_to_end(key)
+        while len(_entries) > CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def get_stats() -> dict:
+    """
+    Get cache statistics.
+
+    Returns:
+        dict: Hit/miss counters, size, TTL and table versions
+    """
+    with _lock:
+        return {
+            **_stats,
+            "entries": len(_entries),
+            "ttl_seconds": CACHE_TTL_SECONDS,
+            "versions": dict(_versions)
+        }
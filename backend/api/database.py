@@ -1,12 +1,26 @@
+import asyncio
 import os
+import threading
+import time
 import mysql.connector
+from collections import OrderedDict
+from functools import partial
 from mysql.connector import pooling, Error
-from typing import Optional
+from mysql.connector.errors import PoolError
+from typing import Callable, Dict, List, Optional, Sequence
 from dotenv import load_dotenv
+from api.profiling import phase
 
 # Load environment variables
 load_dotenv()
 
+# Server-side prepared statement cache (per pooled connection)
+PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "false").lower() == "true"
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "32"))
+
+# Seconds to wait for a free pooled connection before failing
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or 10)
+
 # Database configuration
 DB_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
@@ -14,22 +28,87 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD", ""),
     "database": os.getenv("DB_NAME", "space_station_db"),
     "pool_name": "space_station_pool",
-    "pool_size": 5,
-    "pool_reset_session": True
+    # Set per worker by run_prod.py so all workers fit in max_connections
+    "pool_size": int(os.getenv("DB_POOL_SIZE") or 5),
+    # Resetting the session deallocates prepared statements, so keep
+    # sessions alive when the statement cache is in use
+    "pool_reset_session": not PREPARED_STATEMENTS
 }
 
-# Initialize connection pool
-try:
-    connection_pool = pooling.MySQLConnectionPool(**DB_CONFIG)
-except Error as e:
-    print(f"Error creating connection pool: {e}")
-    connection_pool = None
+# Connection pool, created lazily once per process so forked workers
+# never share sockets inherited from a parent
+connection_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_pool_stats = {"waits": 0, "timeouts": 0}
+
+
+def get_connection_pool():
+    """
+    Get the connection pool for the current process, creating it on first use.
+    
+    Returns:
+        pooling.MySQLConnectionPool: Connection pool, or None if it cannot be created
+    """
+    global connection_pool, _pool_pid
+    
+    pid = os.getpid()
+    if _pool_pid == pid:
+        return connection_pool
+    
+    with _pool_lock:
+        if _pool_pid != pid:
+            try:
+                connection_pool = pooling.MySQLConnectionPool(**DB_CONFIG)
+            except Error as e:
+                print(f"Error creating connection pool: {e}")
+                connection_pool = None
+            _pool_pid = pid
+    
+    return connection_pool
+
+
+def _get_pooled_connection(pool):
+    """
+    Take a connection from the pool, waiting up to POOL_TIMEOUT for one to be returned.
+    
+    mysql-connector raises PoolError as soon as the pool is empty, so
+    retry with a short backoff instead of failing the request.
+    """
+    try:
+        return pool.get_connection()
+    except PoolError:
+        _pool_stats["waits"] += 1
+    
+    deadline = time.monotonic() + POOL_TIMEOUT
+    delay = 0.005
+    while True:
+        time.sleep(delay)
+        try:
+            return pool.get_connection()
+        except PoolError:
+            if time.monotonic() >= deadline:
+                _pool_stats["timeouts"] += 1
+                raise
+        delay = min(delay * 2, 0.05)
+
+
+def get_pool_stats() -> dict:
+    """
+    Get connection pool statistics.
+    
+    Returns:
+        dict: Pool size, timeout and how often callers waited or timed out
+    """
+    return {**_pool_stats, "size": DB_CONFIG["pool_size"], "timeout_seconds": POOL_TIMEOUT}
 
 
 def get_db_connection():
     """
     Get a database connection from the pool.
     
+    Waits up to DB_POOL_TIMEOUT seconds when every pooled connection is in use.
+    
     Returns:
         mysql.connector.connection.MySQLConnection: Database connection
         
@@ -37,8 +116,9 @@ def get_db_connection():
         Exception: If connection cannot be established
     """
     try:
-        if connection_pool:
-            connection = connection_pool.get_connection()
+        pool = get_connection_pool()
+        if pool:
+            connection = _get_pooled_connection(pool)
             if connection.is_connected():
                 return connection
         else:
@@ -54,14 +134,141 @@ def get_db_connection():
         raise Exception(f"Error connecting to MySQL database: {e}")
 
 
-def execute_query(query: str, params: Optional[tuple] = None, fetch: str = "all"):
+_statement_cache_lock = threading.Lock()
+_statement_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+
+def canonical_sql(query: str) -> str:
+    """
+    Normalise whitespace in a SQL string so equivalent queries share a cache key.
+    
+    Args:
+        query: SQL query string
+        
+    Returns:
+        str: Canonical SQL text
+    """
+    return " ".join(query.split())
+
+
+def build_update_query(table: str, key_column: str, columns: Sequence[str], values: dict, key):
+    """
+    Build a canonical UPDATE statement for a partial update.
+    
+    Every updatable column is always present in the SET clause and keeps its
+    current value when the new value is None, so each table has exactly one
+    UPDATE shape regardless of which fields a request changes.
+    
+    Args:
+        table: Table name
+        key_column: Primary key column used in the WHERE clause
+        columns: All updatable columns, in a fixed order
+        values: New values for the columns being changed
+        key: Primary key value of the row to update
+        
+    Returns:
+        tuple: (query, params)
+    """
+    assignments = ", ".join(f"{column} = COALESCE(%s, {column})" for column in columns)
+    query = f"UPDATE {table} SET {assignments} WHERE {key_column} = %s"
+    params = tuple(values.get(column) for column in columns) + (key,)
+    return query, params
+
+
+def _invalidate_statements(cnx):
+    """Close and forget all cached prepared statements for a connection."""
+    statements = getattr(cnx, "_statement_cache", None)
+    if not statements:
+        return
+    
+    for cursor, _ in statements.values():
+        try:
+            cursor.close()
+        except Error:
+            pass
+    statements.clear()
+    
+    with _statement_cache_lock:
+        _statement_cache_stats["invalidations"] += 1
+
+
+def _get_prepared_cursor(connection, query: str):
+    """
+    Get a prepared-statement cursor for a query from the connection's LRU cache.
+    
+    Args:
+        connection: Pooled database connection
+        query: Canonical SQL query string
+        
+    Returns:
+        tuple: (cursor, sql) where sql is the exact string object the
+        statement was prepared with (the connector compares by identity)
+    """
+    # PooledMySQLConnection wraps the real connection, which outlives checkouts
+    cnx = getattr(connection, "_cnx", connection)
+    statements = getattr(cnx, "_statement_cache", None)
+    
+    if statements is None:
+        statements = OrderedDict()
+        cnx._statement_cache = statements
+        cnx._statement_cache_owner = cnx.connection_id
+    elif cnx._statement_cache_owner != cnx.connection_id:
+        # The connection was re-established; server-side statements are gone
+        _invalidate_statements(cnx)
+        cnx._statement_cache_owner = cnx.connection_id
+    
+    entry = statements.get(query)
+    if entry is not None:
+        statements.move_to_end(query)
+        with _statement_cache_lock:
+            _statement_cache_stats["hits"] += 1
+        return entry
+    
+    with _statement_cache_lock:
+        _statement_cache_stats["misses"] += 1
+    
+    entry = (connection.cursor(prepared=True, dictionary=True), query)
+    statements[query] = entry
+    
+    while len(statements) > STATEMENT_CACHE_SIZE:
+        _, (evicted, _) = statements.popitem(last=False)
+        evicted.close()
+        with _statement_cache_lock:
+            _statement_cache_stats["evictions"] += 1
+    
+    return entry
+
+
+def get_statement_cache_stats() -> dict:
+    """
+    Get prepared statement cache metrics.
+    
+    Returns:
+        dict: Hit, miss, eviction and invalidation counters
+    """
+    with _statement_cache_lock:
+        stats = dict(_statement_cache_stats)
+    
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["enabled"] = PREPARED_STATEMENTS
+    stats["capacity"] = STATEMENT_CACHE_SIZE
+    return stats
+
+
+def execute_query(query: str, params: Optional[tuple] = None, fetch: str = "all", prepare: bool = True):
     """
     Execute a SQL query with error handling.
     
     Args:
         query: SQL query string
         params: Query parameters (optional)
-        fetch: "all", "one", or "none" for SELECT queries
+        fetch: "all", "one", or "none" for SELECT queries, "lastrowid"
+            to return the AUTO_INCREMENT ID generated by an INSERT, or
+            "rowcount" to return the number of rows affected
+        prepare: Use the prepared statement cache when it is enabled. Pass
+            False for statements whose shape varies with the data (e.g.
+            multi-row INSERTs), so they do not evict reusable statements
         
     Returns:
         Query results or None
@@ -71,38 +278,269 @@ def execute_query(query: str, params: Optional[tuple] = None, fetch: str = "all"
     """
     connection = None
     cursor = None
+    prepared = False
     
     try:
-        connection = get_db_connection()
-        cursor = connection.cursor(dictionary=True)
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
+        with phase("pool_wait"):
+            connection = get_db_connection()
         
-        if fetch == "all":
-            result = cursor.fetchall()
-        elif fetch == "one":
-            result = cursor.fetchone()
+        if PREPARED_STATEMENTS and prepare and hasattr(connection, "_cnx"):
+            cursor, query = _get_prepared_cursor(connection, canonical_sql(query))
+            prepared = True
+            with phase("query"):
+                cursor.execute(query, tuple(params) if params else ())
+            
+            # Prepared cursors are reused, so always drain the result set
+            with phase("fetch"):
+                rows = cursor.fetchall() if cursor.with_rows else None
+            if fetch == "all":
+                result = rows
+            elif fetch == "one":
+                result = rows[0] if rows else None
+            elif fetch == "lastrowid":
+                result = cursor.lastrowid
+            elif fetch == "rowcount":
+                result = cursor.rowcount
+            else:
+                result = None
         else:
-            result = None
+            cursor = connection.cursor(dictionary=True)
+            
+            with phase("query"):
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+            
+            with phase("fetch"):
+                if fetch == "all":
+                    result = cursor.fetchall()
+                elif fetch == "one":
+                    result = cursor.fetchone()
+                elif fetch == "lastrowid":
+                    result = cursor.lastrowid
+                elif fetch == "rowcount":
+                    result = cursor.rowcount
+                else:
+                    result = None
         
-        connection.commit()
+        with phase("commit"):
+            connection.commit()
         return result
         
     except Error as e:
         if connection:
             connection.rollback()
+            if prepared:
+                _invalidate_statements(getattr(connection, "_cnx", connection))
         raise Exception(f"Database query error: {e}")
         
     finally:
-        if cursor:
+        if cursor and not prepared:
             cursor.close()
         if connection and connection.is_connected():
             connection.close()
 
 
+class BatchLoader:
+    """
+    Coalesce single-key lookups into batched queries.
+    
+    Every ``load`` made during one event-loop tick is collected and
+    resolved with a single call to ``batch_fn`` (typically one
+    ``WHERE key IN (...)`` query) on a worker thread. Concurrent requests
+    looking up the same kind of row therefore share one round trip, and
+    duplicate keys are fetched once. Results are not cached between ticks.
+    
+    Only one batch per loader runs at a time, so a loader never holds more
+    than one pooled connection. Keys requested while a batch is running
+    wait and are fetched together in the next batch.
+    """
+    
+    def __init__(self, batch_fn: Callable[[List], Dict], max_batch_size: int = 500):
+        """
+        Args:
+            batch_fn: Takes a list of keys and returns {key: row} for the keys found
+            max_batch_size: Maximum keys per ``batch_fn`` call
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._pending: Dict = {}
+        self._in_flight = False
+        self._loop = None
+        self._stats = {"loads": 0, "keys": 0, "batches": 0, "errors": 0}
+    
+    async def load(self, key):
+        """
+        Look up one key, batched with other lookups in the same tick.
+        
+        Args:
+            key: Key to look up
+            
+        Returns:
+            The row for the key, or None if it does not exist
+            
+        Raises:
+            Exception: If the batch query fails
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = {}
+            self._in_flight = False
+        
+        self._stats["loads"] += 1
+        future = self._pending.get(key)
+        if future is None:
+            if not self._pending and not self._in_flight:
+                # First lookup this tick: resolve the batch once every
+                # task that is ready now has had the chance to add to it.
+                # While a batch is running, _resolve dispatches the next one.
+                loop.call_soon(self._dispatch)
+            future = loop.create_future()
+            self._pending[key] = future
+        
+        # Shield so one cancelled caller does not cancel a shared lookup
+        return await asyncio.shield(future)
+    
+    async def load_many(self, keys: Sequence) -> list:
+        """
+        Look up several keys with as few batch queries as possible.
+        
+        Args:
+            keys: Keys to look up
+            
+        Returns:
+            list: Rows (or None) in the same order as keys
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+    
+    def _dispatch(self):
+        """Send up to max_batch_size waiting keys to batch_fn on the thread pool."""
+        if not self._pending:
+            return
+        
+        keys = list(self._pending)[:self.max_batch_size]
+        batch = {key: self._pending.pop(key) for key in keys}
+        self._stats["keys"] += len(keys)
+        self._stats["batches"] += 1
+        self._in_flight = True
+        
+        task = self._loop.run_in_executor(None, self.batch_fn, keys)
+        task.add_done_callback(partial(self._resolve, batch))
+    
+    def _resolve(self, batch: dict, task: asyncio.Future):
+        """Hand each waiting caller its row (or the batch error), then start the next batch."""
+        error = task.exception()
+        if error is not None:
+            self._stats["errors"] += 1
+        else:
+            rows = task.result()
+        
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(rows.get(key))
+        
+        self._in_flight = False
+        self._dispatch()
+    
+    def get_stats(self) -> dict:
+        """
+        Get loader statistics.
+        
+        Returns:
+            dict: Lookup, key and batch counters
+        """
+        loads = self._stats["loads"]
+        return {
+            **self._stats,
+            "keys_per_batch": round(self._stats["keys"] / self._stats["batches"], 2) if self._stats["batches"] else 0.0,
+            "queries_saved": loads - self._stats["batches"]
+        }
+
+
+def pad_keys(keys: Sequence) -> list:
+    """
+    Pad a key list to the next power of two by repeating the last key.
+    
+    ``IN (...)`` lists then come in a few fixed lengths, so batched
+    queries reuse a handful of cached prepared statements instead of
+    preparing one per batch size. Repeated keys do not change the result.
+    
+    Args:
+        keys: Non-empty sequence of keys
+        
+    Returns:
+        list: The keys followed by copies of the last one
+    """
+    size = 1
+    while size < len(keys):
+        size *= 2
+    return list(keys) + [keys[-1]] * (size - len(keys))
+
+
+def fetch_crew(crew_ids: Sequence[int]) -> Dict[int, dict]:
+    """
+    Fetch several crew members with a single query.
+    
+    Args:
+        crew_ids: Crew member IDs
+        
+    Returns:
+        Dict[int, dict]: Crew rows (including password) keyed by crew ID;
+        unknown IDs are omitted
+    """
+    if not crew_ids:
+        return {}
+    
+    keys = pad_keys(crew_ids)
+    placeholders = ", ".join(["%s"] * len(keys))
+    rows = execute_query(
+        f"""
+            SELECT crew_id, name, role, nationality, password
+            FROM crew
+            WHERE crew_id IN ({placeholders})
+        """,
+        tuple(keys),
+        fetch="all"
+    )
+    return {row["crew_id"]: row for row in rows}
+
+
+# Shared crew loader used by login and the crew foreign-key checks
+crew_loader = BatchLoader(fetch_crew)
+
+
+async def load_crew(crew_id: int) -> Optional[dict]:
+    """
+    Look up a crew member, batched with concurrent lookups.
+    
+    Args:
+        crew_id: ID of the crew member
+        
+    Returns:
+        Optional[dict]: Crew row (including password), or None if not found
+    """
+    return await crew_loader.load(crew_id)
+
+
+async def crew_exists(crew_id: int) -> bool:
+    """
+    Check whether a crew member exists, batched with concurrent lookups.
+    
+    Args:
+        crew_id: ID of the crew member
+        
+    Returns:
+        bool: True if the crew member exists
+    """
+    return await crew_loader.load(crew_id) is not None
+
+
 def test_connection():
     """
     Test the database connection.
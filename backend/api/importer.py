@@ -0,0 +1,218 @@
+"""
+Bulk import of crew, missions and experiments from CSV or NDJSON.
+
+Files are read as a stream and processed in fixed-size chunks, so memory
+use does not grow with file size. Each row is validated against the
+request models in api.models, crew foreign keys are checked against an
+in-memory set of crew IDs loaded once per import, and valid rows are
+written with one multi-row INSERT per chunk.
+
+Imported rows are not added to the change history: a multi-row INSERT
+does not report the ID of each new row, only the first one.
+"""
+
+import csv
+import json
+import time
+from typing import Callable, IO, Iterator, Optional, Tuple
+
+from pydantic import ValidationError
+
+from api.database import execute_query
+from api.models import CrewCreate, MissionCreate, ExperimentCreate, ImportReport, ImportRowError
+from api import cache, read_model
+
+# Rows per multi-row INSERT
+DEFAULT_CHUNK_SIZE = 1000
+
+# Rejected rows listed in the report (all are counted)
+MAX_REPORTED_ERRORS = 100
+
+# Entity name -> (table, request model, columns in insert order)
+ENTITIES = {
+    "crew": ("crew", CrewCreate, ("crew_id", "password", "name", "role", "nationality")),
+    "mission": ("mission", MissionCreate, ("name", "purpose", "crew_id")),
+    "experiment": ("experiment", ExperimentCreate, ("title", "status", "crew_id")),
+}
+
+FORMATS = ("csv", "ndjson")
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Stream records from a CSV or NDJSON text file.
+
+    Args:
+        stream: Text stream (opened with newline="" for CSV)
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        tuple: (line number, record dict) or (line number, error message)
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, record
+
+
+def _load_crew_ids() -> set:
+    """Load all existing crew IDs for foreign-key checks."""
+    rows = execute_query("SELECT crew_id FROM crew", fetch="all")
+    return {row["crew_id"] for row in rows}
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Turn a Pydantic validation error into a one-line message."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def import_stream(
+    entity: str,
+    stream: IO[str],
+    fmt: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[ImportReport], None]] = None
+) -> ImportReport:
+    """
+    Import records from a stream into the database.
+
+    Args:
+        entity: "crew", "mission" or "experiment"
+        stream: Text stream to read from
+        fmt: "csv" or "ndjson"
+        chunk_size: Number of rows per multi-row INSERT
+        progress: Optional callback invoked with the report after each chunk
+
+    Returns:
+        ImportReport: Counts of read, inserted and rejected rows, with errors
+
+    Raises:
+        ValueError: If the entity or format is not supported
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Unsupported entity '{entity}', expected one of: {', '.join(ENTITIES)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of: {', '.join(FORMATS)}")
+
+    table, model, columns = ENTITIES[entity]
+    row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    insert_prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+
+    report = ImportReport(entity=entity)
+    started = time.perf_counter()
+    crew_ids = _load_crew_ids()
+    chunk = []
+
+    def reject(line: int, message: str):
+        report.rows_rejected += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(ImportRowError(line=line, error=message))
+
+    def flush_chunk():
+        if not chunk:
+            return
+
+        query = insert_prefix + ", ".join([row_placeholder] * len(chunk))
+        params = tuple(value for _, values in chunk for value in values)
+
+        try:
+            execute_query(query, params, fetch="none", prepare=False)
+            report.rows_inserted += len(chunk)
+        except Exception as e:
+            # The whole chunk is rolled back; report it against its first line
+            if entity == "crew":
+                crew_ids.difference_update(values[0] for _, values in chunk)
+            report.rows_rejected += len(chunk)
+            if len(report.errors) < MAX_REPORTED_ERRORS:
+                report.errors.append(ImportRowError(
+                    line=chunk[0][0],
+                    error=f"Chunk of {len(chunk)} rows failed: {e}"
+                ))
+
+        report.chunks += 1
+        chunk.clear()
+
+        if progress:
+            report.elapsed_seconds = round(time.perf_counter() - started, 3)
+            progress(report)
+
+    for line, record in read_records(stream, fmt):
+        report.rows_read += 1
+
+        if isinstance(record, str):
+            reject(line, record)
+            continue
+
+        if None in record:
+            # csv.DictReader puts surplus values under a None key
+            reject(line, "Row has more fields than the header")
+            continue
+
+        try:
+            item = model(**record)
+        except ValidationError as e:
+            reject(line, _format_validation_error(e))
+            continue
+        except TypeError as e:
+            # e.g. non-string keys that cannot be passed as keyword arguments
+            reject(line, f"Invalid record: {e}")
+            continue
+
+        if entity == "crew":
+            if item.crew_id in crew_ids:
+                reject(line, f"Crew member with ID {item.crew_id} already exists")
+                continue
+            crew_ids.add(item.crew_id)
+        elif item.crew_id not in crew_ids:
+            reject(line, f"Crew member with ID {item.crew_id} not found")
+            continue
+
+        chunk.append((line, tuple(getattr(item, column) for column in columns)))
+
+        if len(chunk) >= chunk_size:
+            flush_chunk()
+
+    flush_chunk()
+
+    if report.rows_inserted:
+        cache.bump_version(table)
+        # New IDs are not known per row, so rebuild the read model
+        if read_model.is_ready():
+            read_model.load()
+
+    report.elapsed_seconds = round(time.perf_counter() - started, 3)
+    return report
+
+
+def detect_format(filename: str) -> str:
+    """
+    Guess the file format from a file name.
+
+    Args:
+        filename: File name or path
+
+    Returns:
+        str: "csv" or "ndjson"
+    """
+    lowered = filename.lower()
+    if lowered.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    return "csv"
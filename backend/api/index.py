@@ -1,8 +1,49 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from api.routes import auth, missions, experiments
-from api.database import test_connection
+from api.routes import auth, missions, experiments, crew, imports, history, jobs
+from api.database import test_connection, get_pool_stats, get_statement_cache_stats, crew_loader
+from api import audit, cache, rate_limit, read_model, scheduler, write_behind
+from api.profiling import ProfileMiddleware
+
+
+def register_jobs():
+    """Register the periodic background jobs with the scheduler."""
+    if read_model.is_enabled() and read_model.CONSISTENCY_CHECK_INTERVAL > 0:
+        scheduler.schedule(
+            "read_model_consistency",
+            read_model.check_consistency,
+            interval=read_model.CONSISTENCY_CHECK_INTERVAL
+        )
+    
+    if audit.RETENTION_DAYS > 0:
+        scheduler.schedule(
+            "history_retention",
+            audit.purge_expired,
+            interval=audit.PURGE_INTERVAL,
+            initial_delay=60
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: start-up and shutdown hooks.
+    
+    Loads the read model (when enabled) and starts the background job
+    scheduler on start-up. On shutdown, waits for running jobs and
+    flushes any queued experiment status updates and change history
+    records before the process exits.
+    """
+    read_model.start()
+    register_jobs()
+    await scheduler.start()
+    yield
+    await scheduler.shutdown()
+    write_behind.shutdown()
+    audit.shutdown()
+
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -10,9 +51,14 @@ app = FastAPI(
     description="Backend API for managing space station crew, missions, and experiments",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Per-route rate limiting, checked before routing and any database work.
+# Added before CORS so that 429 responses still carry CORS headers.
+app.add_middleware(rate_limit.RateLimitMiddleware)
+
 # Configure CORS middleware for Angular frontend
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +68,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in per-request profiling (PROFILE_SAMPLE_RATE, or X-Profile: <PROFILE_TOKEN>)
+app.add_middleware(ProfileMiddleware)
+
 
 # Root endpoint
 @app.get("/", status_code=status.HTTP_200_OK)
@@ -57,10 +106,38 @@ async def health_check():
     }
 
 
+# Metrics endpoint
+@app.get("/metrics", status_code=status.HTTP_200_OK)
+async def metrics():
+    """
+    Runtime metrics for the data layer and in-process caches.
+    
+    Returns:
+        dict: Connection pool, prepared statement cache, response cache,
+        write-behind queue, change history, read model, job scheduler, crew
+        loader and rate limiter metrics
+    """
+    return {
+        "pool": get_pool_stats(),
+        "statement_cache": get_statement_cache_stats(),
+        "response_cache": cache.get_stats(),
+        "write_behind": write_behind.get_stats(),
+        "audit": audit.get_stats(),
+        "read_model": read_model.get_stats(),
+        "scheduler": scheduler.get_stats(),
+        "crew_loader": crew_loader.get_stats(),
+        "rate_limit": rate_limit.get_stats()
+    }
+
+
 # Register route modules
 app.include_router(auth.router)
 app.include_router(missions.router)
 app.include_router(experiments.router)
+app.include_router(crew.router)
+app.include_router(imports.router)
+app.include_router(history.router)
+app.include_router(jobs.router)
 
 
 # Global exception handler
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, FrozenSet, List, Optional
 
 
 # ===========================
@@ -33,6 +35,15 @@ class CrewMember(BaseModel):
     nationality: str
 
 
+class CrewCreate(BaseModel):
+    """Request model for creating a crew member (used by bulk import)"""
+    crew_id: int = Field(..., description="Crew member ID")
+    password: str = Field(..., min_length=1, max_length=255)
+    name: str = Field(..., min_length=1, max_length=255)
+    role: str = Field(..., min_length=1, max_length=100)
+    nationality: str = Field(..., min_length=1, max_length=100)
+
+
 # ===========================
 # Mission Models
 # ===========================
@@ -73,17 +84,63 @@ class MissionCreateResponse(BaseModel):
 # Experiment Models
 # ===========================
 
+class ExperimentStatus(str, Enum):
+    """Experiment lifecycle status (stored as a MySQL ENUM)"""
+    PLANNED = "Planned"
+    IN_PROGRESS = "In Progress"
+    ON_HOLD = "On Hold"
+    COMPLETED = "Completed"
+    CANCELLED = "Cancelled"
+
+
+# Status -> statuses it may change to. Completed and Cancelled are final.
+EXPERIMENT_STATUS_TRANSITIONS: Dict[ExperimentStatus, FrozenSet[ExperimentStatus]] = {
+    ExperimentStatus.PLANNED: frozenset({ExperimentStatus.IN_PROGRESS, ExperimentStatus.CANCELLED}),
+    ExperimentStatus.IN_PROGRESS: frozenset({
+        ExperimentStatus.ON_HOLD, ExperimentStatus.COMPLETED, ExperimentStatus.CANCELLED
+    }),
+    ExperimentStatus.ON_HOLD: frozenset({ExperimentStatus.IN_PROGRESS, ExperimentStatus.CANCELLED}),
+    ExperimentStatus.COMPLETED: frozenset(),
+    ExperimentStatus.CANCELLED: frozenset(),
+}
+
+
+def is_status_transition_allowed(current: Optional[str], new: str) -> bool:
+    """
+    Check an experiment status change against EXPERIMENT_STATUS_TRANSITIONS.
+
+    Args:
+        current: Current status value
+        new: Requested status value
+
+    Returns:
+        bool: True if the change is allowed. Keeping the same status is always
+        allowed, and so is any change away from an unrecognised legacy value.
+    """
+    if current == new:
+        return True
+    try:
+        current_status = ExperimentStatus(current)
+    except ValueError:
+        return True
+    return ExperimentStatus(new) in EXPERIMENT_STATUS_TRANSITIONS[current_status]
+
+
 class ExperimentCreate(BaseModel):
     """Request model for creating an experiment"""
+    model_config = ConfigDict(use_enum_values=True)
+
     title: str = Field(..., min_length=1, max_length=255)
-    status: str = Field(..., min_length=1, max_length=100)
+    status: ExperimentStatus = Field(..., description="Initial status")
     crew_id: int = Field(..., description="Assigned crew member ID")
 
 
 class ExperimentUpdate(BaseModel):
     """Request model for updating an experiment"""
+    model_config = ConfigDict(use_enum_values=True)
+
     title: Optional[str] = Field(None, min_length=1, max_length=255)
-    status: Optional[str] = Field(None, min_length=1, max_length=100)
+    status: Optional[ExperimentStatus] = Field(None, description="New status (see EXPERIMENT_STATUS_TRANSITIONS)")
     crew_id: Optional[int] = Field(None, description="Assigned crew member ID")
 
 
@@ -96,6 +153,12 @@ class ExperimentResponse(BaseModel):
     crew_name: str = Field(..., description="Name of assigned crew member")
 
 
+class ExperimentStatusCounts(BaseModel):
+    """Response model for experiment counts per status"""
+    counts: Dict[str, int] = Field(..., description="Number of experiments for each status")
+    total: int
+
+
 class ExperimentCreateResponse(BaseModel):
     """Response model for experiment creation"""
     experiment_id: int
@@ -105,6 +168,81 @@ class ExperimentCreateResponse(BaseModel):
     message: str = "Experiment created successfully"
 
 
+# ===========================
+# Dashboard Models
+# ===========================
+
+class CrewDashboard(BaseModel):
+    """Response model for a crew member's dashboard"""
+    crew: CrewMember
+    missions: List[MissionResponse]
+    experiments: List[ExperimentResponse]
+
+
+# ===========================
+# History Models
+# ===========================
+
+class HistoryEntry(BaseModel):
+    """A single change to a mission or experiment"""
+    change_id: int
+    entity: str
+    entity_id: int
+    action: str = Field(..., description="create, update or delete")
+    crew_id: Optional[int] = Field(None, description="Assigned crew member after the change")
+    changes: Dict[str, List[Any]] = Field(..., description="Changed fields as [old, new] pairs")
+    changed_at: datetime = Field(..., description="Time of the change (UTC)")
+
+
+# ===========================
+# Import Models
+# ===========================
+
+class ImportRowError(BaseModel):
+    """A row rejected during bulk import"""
+    line: int = Field(..., description="Line number in the source file (header is line 1 for CSV)")
+    error: str
+
+
+class ImportReport(BaseModel):
+    """Response model for a bulk import"""
+    entity: str
+    rows_read: int = 0
+    rows_inserted: int = 0
+    rows_rejected: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[ImportRowError] = []
+
+
+# ===========================
+# Job Models
+# ===========================
+
+class JobStatus(BaseModel):
+    """Status and run statistics of a background job"""
+    name: str
+    kind: str = Field(..., description="periodic or once")
+    interval_seconds: Optional[float] = None
+    jitter_seconds: float
+    running: bool
+    next_run_in: Optional[float] = Field(None, description="Seconds until the next run")
+    runs: int
+    failures: int
+    skipped: int = Field(..., description="Runs skipped because the previous run was still going")
+    average_seconds: Optional[float] = None
+    last_started: Optional[datetime] = None
+    last_duration: Optional[float] = None
+    last_result: Optional[str] = None
+    last_error: Optional[str] = None
+
+
+class JobsOverview(BaseModel):
+    """Response model for the job scheduler status"""
+    scheduler: Dict[str, Any]
+    jobs: List[JobStatus]
+
+
 # ===========================
 # Generic Response Models
 # ===========================
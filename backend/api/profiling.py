@@ -0,0 +1,343 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when it is picked by the PROFILE_SAMPLE_RATE
+sampler, or carries an ``X-Profile`` header equal to PROFILE_TOKEN (the
+header is ignored when no token is configured). Profiled requests get a
+``Server-Timing`` response header that breaks the time down into
+phases (pool wait, query, fetch, model build, serialise).
+
+Every request is timed, and those slower than SLOW_REQUEST_MS are written
+to a rotating slow-request log. Profiled requests are logged with their
+phase breakdown and, optionally, a cProfile dump that can be turned into
+a flamegraph; other requests only with their total time.
+At most PROFILE_CPROFILE_MAX_FILES dumps are kept. A dump is only saved
+when no other request ran during the profiled one, because cProfile
+records everything on the event-loop thread.
+
+The middleware is plain ASGI. Requests that are not profiled pay for a
+random number (when sampling is on), a header scan (when a token is
+set), two counter updates and two clock reads. The phase timers are
+no-ops outside a profiled request.
+"""
+
+import cProfile
+import hmac
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+# Profiling configuration
+PROFILE_HEADER = b"x-profile"
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+SLOW_REQUEST_LOG = os.getenv("SLOW_REQUEST_LOG", "slow_requests.log")
+SLOW_REQUEST_LOG_BYTES = int(os.getenv("SLOW_REQUEST_LOG_BYTES", str(10 * 1024 * 1024)))
+SLOW_REQUEST_LOG_BACKUPS = int(os.getenv("SLOW_REQUEST_LOG_BACKUPS", "5"))
+PROFILE_CPROFILE_DIR = os.getenv("PROFILE_CPROFILE_DIR", "")
+PROFILE_CPROFILE_MAX_FILES = int(os.getenv("PROFILE_CPROFILE_MAX_FILES") or 20)
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+# cProfile hooks the whole thread, so only one request is profiled at a time
+_cprofile_lock = threading.Lock()
+
+_slow_logger: Optional[logging.Logger] = None
+
+# Requests currently in progress / started so far (to detect overlap with a cProfile run)
+_active_requests = 0
+_started_requests = 0
+
+
+class RequestProfile:
+    """Accumulated phase timings for a single request."""
+
+    __slots__ = ("phases", "marks")
+
+    def __init__(self):
+        self.phases = {}
+        self.marks = {}
+
+    def add(self, name: str, seconds: float):
+        """Add time to a phase."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def mark(self, name: str):
+        """Record a point in time."""
+        self.marks[name] = time.perf_counter()
+
+    def span(self, start: str, end: str) -> float:
+        """Time between two marks, or 0 if either is missing."""
+        if start in self.marks and end in self.marks:
+            return self.marks[end] - self.marks[start]
+        return 0.0
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Time a block of code as a named phase of the current request.
+
+    Does nothing when the current request is not being profiled.
+
+    Args:
+        name: Phase name (e.g. "query", "model_build")
+    """
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - start)
+
+
+class ProfiledRoute(APIRoute):
+    """
+    API route that records when the endpoint starts and finishes.
+
+    Everything between the route handler starting and the endpoint being
+    called is request parsing and validation; everything after the
+    endpoint returns is response validation and serialisation.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        @wraps(endpoint)
+        async def timed_endpoint(*args, **kw):
+            profile = _current.get()
+            if profile is None:
+                return await endpoint(*args, **kw)
+
+            profile.mark("endpoint_start")
+            try:
+                return await endpoint(*args, **kw)
+            finally:
+                profile.mark("endpoint_end")
+
+        super().__init__(path, timed_endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request):
+            profile = _current.get()
+            if profile is None:
+                return await handler(request)
+
+            profile.mark("route_start")
+            try:
+                return await handler(request)
+            finally:
+                profile.mark("route_end")
+
+        return timed_handler
+
+
+def _get_slow_logger() -> logging.Logger:
+    """Create the rotating slow-request logger on first use."""
+    global _slow_logger
+
+    if _slow_logger is None:
+        logger = logging.getLogger("api.slow_requests")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = RotatingFileHandler(
+            SLOW_REQUEST_LOG,
+            maxBytes=SLOW_REQUEST_LOG_BYTES,
+            backupCount=SLOW_REQUEST_LOG_BACKUPS
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        _slow_logger = logger
+
+    return _slow_logger
+
+
+def _breakdown(profile: RequestProfile, total: float) -> dict:
+    """
+    Build the per-phase breakdown in milliseconds.
+
+    Args:
+        profile: Profile of the finished request
+        total: Total request time in seconds
+
+    Returns:
+        dict: Phase name to milliseconds
+    """
+    phases = dict(profile.phases)
+    phases["parse"] = profile.span("route_start", "endpoint_start")
+    phases["serialise"] = profile.span("endpoint_end", "route_end")
+
+    endpoint = profile.span("endpoint_start", "endpoint_end")
+    measured = sum(profile.phases.values())
+    phases["handler"] = max(0.0, endpoint - measured)
+    phases["total"] = total
+
+    return {name: round(seconds * 1000, 3) for name, seconds in phases.items() if seconds}
+
+
+def _profile_header_matches(scope: dict) -> bool:
+    """Check the X-Profile header against PROFILE_TOKEN."""
+    if not PROFILE_TOKEN:
+        return False
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return hmac.compare_digest(value, PROFILE_TOKEN.encode("latin-1"))
+    return False
+
+
+def _should_profile(scope: dict) -> bool:
+    """Decide whether to profile a request (header opt-in or sampling)."""
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return True
+    return _profile_header_matches(scope)
+
+
+def _prune_dumps():
+    """Delete the oldest cProfile dumps beyond PROFILE_CPROFILE_MAX_FILES."""
+    dumps = sorted(
+        (entry for entry in os.scandir(PROFILE_CPROFILE_DIR) if entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in dumps[:max(0, len(dumps) - PROFILE_CPROFILE_MAX_FILES)]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _slow_record(scope: dict, status: Optional[int], phases_ms: dict) -> dict:
+    """
+    Build a slow-request log record.
+
+    Args:
+        scope: ASGI scope of the request
+        status: Response status code, if a response was started
+        phases_ms: Phase breakdown (or just the total) in milliseconds
+
+    Returns:
+        dict: Record to write to the slow-request log
+    """
+    return {
+        "method": scope["method"],
+        "path": scope["path"],
+        "query": scope.get("query_string", b"").decode("latin-1"),
+        "status": status,
+        "phases_ms": phases_ms,
+    }
+
+
+class ProfileMiddleware:
+    """
+    ASGI middleware that times every request and profiles opted-in or sampled ones.
+
+    Profiled responses get a Server-Timing header. Any request slower than
+    SLOW_REQUEST_MS is written to the slow-request log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _active_requests, _started_requests
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        _started_requests += 1
+        _active_requests += 1
+        try:
+            if not _should_profile(scope):
+                await self._time(scope, receive, send)
+            else:
+                await self._profile(scope, receive, send)
+        finally:
+            _active_requests -= 1
+
+    async def _time(self, scope, receive, send):
+        """Run an unprofiled request, logging it if it is slow."""
+        start = time.perf_counter()
+        status = []
+
+        async def status_send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            await send(message)
+
+        await self.app(scope, receive, status_send)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        if total_ms >= SLOW_REQUEST_MS:
+            record = _slow_record(scope, status[0] if status else None, {"total": round(total_ms, 3)})
+            _get_slow_logger().info(json.dumps(record))
+
+    async def _profile(self, scope, receive, send):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        result = {}
+
+        profiler = None
+        if PROFILE_CPROFILE_DIR and _cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            # cProfile hooks the whole thread, so other requests running
+            # meanwhile would be mixed into the dump; detect that
+            overlap_mark = (_active_requests, _started_requests)
+            profiler.enable()
+
+        start = time.perf_counter()
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                breakdown = _breakdown(profile, time.perf_counter() - start)
+                header = ", ".join(f"{name};dur={ms}" for name, ms in breakdown.items())
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1"))
+                ]
+                result["breakdown"] = breakdown
+                result["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            _current.reset(token)
+            if profiler is not None:
+                profiler.disable()
+                overlapped = overlap_mark != (1, _started_requests)
+                _cprofile_lock.release()
+
+        breakdown = result.get("breakdown")
+        if breakdown is None or breakdown["total"] < SLOW_REQUEST_MS:
+            return
+
+        record = _slow_record(scope, result["status"], breakdown)
+
+        if profiler is not None:
+            if overlapped:
+                record["cprofile"] = "skipped: other requests ran concurrently"
+            else:
+                os.makedirs(PROFILE_CPROFILE_DIR, exist_ok=True)
+                filename = f"{int(time.time() * 1000)}_{scope['method']}_{scope['path'].strip('/').replace('/', '_') or 'root'}.prof"
+                path = os.path.join(PROFILE_CPROFILE_DIR, filename)
+                profiler.dump_stats(path)
+                _prune_dumps()
+                record["cprofile"] = path
+
+        _get_slow_logger().info(json.dumps(record))
@@ -0,0 +1,167 @@
+"""
+Partial-response field projection.
+
+List and detail endpoints accept ``fields=a,b,c``. The requested names are
+checked against a per-entity whitelist that maps each field to the SQL
+expression that produces it, so only those columns are selected and the
+crew JOIN is only added when ``crew_name`` is requested.
+"""
+
+from typing import Dict, List, Optional
+
+# Field name -> SQL select expression
+MISSION_FIELDS: Dict[str, str] = {
+    "mission_id": "m.mission_id",
+    "name": "m.name",
+    "purpose": "m.purpose",
+    "crew_id": "m.crew_id",
+    "crew_name": "c.name AS crew_name",
+}
+
+EXPERIMENT_FIELDS: Dict[str, str] = {
+    "experiment_id": "e.experiment_id",
+    "title": "e.title",
+    "status": "e.status",
+    "crew_id": "e.crew_id",
+    "crew_name": "c.name AS crew_name",
+}
+
+# Fields that need the crew table joined in
+JOINED_FIELDS = {"crew_name"}
+
+
+def parse_fields(fields: Optional[str], allowed: Dict[str, str]) -> Optional[List[str]]:
+    """
+    Parse and validate a comma-separated ``fields`` parameter.
+
+    Args:
+        fields: Raw parameter value, or None when not supplied
+        allowed: Whitelist of field names for the entity
+
+    Returns:
+        Optional[List[str]]: Requested fields in request order (duplicates
+        removed), or None when every field should be returned
+
+    Raises:
+        ValueError: If the list is empty or names an unknown field
+    """
+    if fields is None:
+        return None
+
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    if not requested:
+        raise ValueError("fields must name at least one field")
+
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+
+    return requested
+
+
+def build_select(
+    requested: List[str],
+    allowed: Dict[str, str],
+    table: str,
+    alias: str,
+    key: Optional[str] = None
+) -> str:
+    """
+    Build the SELECT ... FROM ... part of a projected query.
+
+    Args:
+        requested: Validated field names
+        allowed: Whitelist mapping field names to SQL expressions
+        table: Base table name
+        alias: Base table alias used in the expressions
+        key: Field to select even if not requested (e.g. to apply overlays)
+
+    Returns:
+        str: SELECT clause with FROM and, if needed, the crew JOIN
+    """
+    selected = list(requested)
+    if key is not None and key not in selected:
+        selected.append(key)
+
+    query = f"SELECT {', '.join(allowed[name] for name in selected)} FROM {table} {alias}"
+
+    if JOINED_FIELDS.intersection(selected):
+        query += f" INNER JOIN crew c ON {alias}.crew_id = c.crew_id"
+
+    return query
+
+
+def project(rows: list, requested: List[str]) -> list:
+    """
+    Drop helper columns that were selected but not requested.
+
+    Args:
+        rows: Row dictionaries
+        requested: Field names the client asked for
+
+    Returns:
+        list: Rows containing only the requested fields
+    """
+    if rows and len(rows[0]) != len(requested):
+        return [{name: row[name] for name in requested} for row in rows]
+    return rows
+
+
+def build_list_filters(
+    alias: str,
+    key: str,
+    crew_id: Optional[int],
+    limit: Optional[int],
+    offset: int,
+    status: Optional[str] = None,
+    status_overrides: Optional[Dict[int, str]] = None
+):
+    """
+    Build the WHERE / ORDER BY / LIMIT part of a list query.
+
+    Args:
+        alias: Base table alias
+        key: Primary key column (results are ordered by it, newest first)
+        crew_id: Only rows assigned to this crew member
+        limit: Maximum number of rows
+        offset: Number of rows to skip
+        status: Only rows with this status (experiments)
+        status_overrides: Statuses by key that replace the stored ones when
+            filtering (queued write-behind updates)
+
+    Returns:
+        tuple: (SQL suffix, params)
+    """
+    conditions = []
+    params = []
+
+    if crew_id is not None:
+        conditions.append(f"{alias}.crew_id = %s")
+        params.append(crew_id)
+
+    if status is not None:
+        overrides = status_overrides or {}
+        matching = [row_key for row_key, value in overrides.items() if value == status]
+        other = [row_key for row_key, value in overrides.items() if value != status]
+
+        condition = f"{alias}.status = %s"
+        params.append(status)
+        if other:
+            condition += f" AND {alias}.{key} NOT IN ({', '.join(['%s'] * len(other))})"
+            params.extend(other)
+        if matching:
+            condition = f"({condition}) OR {alias}.{key} IN ({', '.join(['%s'] * len(matching))})"
+            params.extend(matching)
+        conditions.append(f"({condition})")
+
+    clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    clause += f" ORDER BY {alias}.{key} DESC"
+
+    if limit is not None or offset:
+        # MySQL needs a LIMIT to use OFFSET; this is its documented "no limit"
+        clause += " LIMIT %s OFFSET %s"
+        params.extend([limit if limit is not None else 18446744073709551615, offset])
+
+    return clause, tuple(params)
@@ -0,0 +1,375 @@
+"""
+Per-route rate limiting with token buckets.
+
+Rules are configured per method and path with RATE_LIMITS, for example::
+
+    RATE_LIMITS="POST /login=10/minute:crew; POST /experiments=60/minute:crew"
+
+Each rule allows LIMIT requests per PERIOD (second, minute or hour),
+with bursts of up to LIMIT. It keeps one bucket per client IP
+(``ip``) and/or per ``crew_id`` in the JSON request body (``crew``).
+A ``crew`` rule falls back to the client IP for requests without a
+usable ``crew_id``. Path segments written as ``{name}`` match any single
+segment. The first rule matching a request applies, and requests matching
+no rule are not limited.
+
+The default rules key on ``crew`` only. Behind a proxy every request
+comes from the proxy's address, so ``ip`` keys are only useful when
+clients connect directly or RATE_LIMIT_TRUST_FORWARDED is set.
+
+The check runs in an ASGI middleware before routing, so rejected
+requests never reach a route handler or the database. Buckets live in a
+pluggable backend. The default MemoryBackend keeps two floats per key in
+``__slots__`` objects and drops keys that have been idle long enough to
+refill completely, so evicting them changes nothing. It is per process;
+set RATE_LIMIT_BACKEND (or call ``set_backend``) to share limits between
+workers.
+"""
+
+import importlib
+import inspect
+import json
+import math
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from starlette.responses import JSONResponse
+
+# Rate limit configuration
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMITS = os.getenv(
+    "RATE_LIMITS",
+    "POST /login=10/minute:crew; POST /experiments=60/minute:crew"
+)
+MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS") or 100000)
+TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+BACKEND = os.getenv("RATE_LIMIT_BACKEND", "")
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+KEY_KINDS = ("ip", "crew")
+
+# Request bodies larger than this are not parsed for a crew_id
+MAX_BODY_BYTES = 64 * 1024
+
+_CREW_ID = TypeAdapter(int)
+
+
+class RateLimitRule:
+    """A rate limit for one method and path pattern"""
+
+    def __init__(self, index: int, method: str, path: str, limit: int, period: int, keys: Tuple[str, ...]):
+        self.index = index
+        self.method = method
+        self.path = path
+        self.limit = limit
+        self.period = period
+        self.keys = keys
+        self.capacity = float(limit)
+        self.refill_rate = limit / period
+        pattern = re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(path.rstrip("/") or "/"))
+        self.pattern = re.compile(f"^{pattern}$")
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+def parse_rules(spec: str) -> List[RateLimitRule]:
+    """
+    Parse a RATE_LIMITS specification.
+
+    Args:
+        spec: Semicolon-separated ``METHOD PATH=LIMIT/PERIOD[:KEYS]`` entries,
+            where KEYS is ``ip``, ``crew`` or ``ip+crew`` (default ``ip``)
+
+    Returns:
+        List[RateLimitRule]: Rules in the order given
+
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    rules = []
+
+    for entry in spec.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+
+        try:
+            target, rate = entry.split("=", 1)
+            method, path = target.split()
+            rate, _, keys = rate.partition(":")
+            limit, period = rate.split("/", 1)
+            limit = int(limit)
+            period = PERIODS[period.strip().lower()]
+        except (ValueError, KeyError):
+            raise ValueError(
+                f"Invalid rate limit '{entry}', expected METHOD PATH=LIMIT/(second|minute|hour)[:ip+crew]"
+            )
+
+        key_kinds = tuple(kind.strip() for kind in (keys or "ip").split("+"))
+        unknown = [kind for kind in key_kinds if kind not in KEY_KINDS]
+        if unknown or limit < 1:
+            raise ValueError(f"Invalid rate limit '{entry}'")
+
+        rules.append(RateLimitRule(len(rules), method.upper(), path, limit, period, key_kinds))
+
+    return rules
+
+
+class RateLimitBackend(ABC):
+    """
+    Token bucket storage.
+
+    Subclass this to share buckets between processes (e.g. in Redis).
+    ``consume`` may be a plain or an async method.
+    """
+
+    @abstractmethod
+    def consume(self, key: tuple, capacity: float, refill_rate: float) -> Tuple[bool, float]:
+        """
+        Take one token from a bucket, creating it full if needed.
+
+        Args:
+            key: Bucket key (rule index, key kind, key value)
+            capacity: Bucket size
+            refill_rate: Tokens added per second
+
+        Returns:
+            tuple: (allowed, seconds until a token is available if not allowed)
+        """
+
+    def get_stats(self) -> dict:
+        """Backend statistics for /metrics."""
+        return {}
+
+
+class _Bucket:
+    """Token count and the time it was last updated"""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    In-process buckets in least-recently-used order.
+
+    Used from the event loop thread only, so no locking is needed.
+    """
+
+    def __init__(self, max_keys: int = MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[tuple, _Bucket]" = OrderedDict()
+        # Longest time any bucket takes to refill; idle keys older than this are full
+        self._idle_after = 0.0
+        self._evictions = 0
+
+    def consume(self, key: tuple, capacity: float, refill_rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = _Bucket(capacity, now)
+            self._buckets[key] = bucket
+            self._idle_after = max(self._idle_after, capacity / refill_rate)
+            self._evict(now)
+        else:
+            bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated) * refill_rate)
+            bucket.updated = now
+            self._buckets.move_to_end(key)
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return True, 0.0
+
+        return False, (1 - bucket.tokens) / refill_rate
+
+    def _evict(self, now: float):
+        """Drop idle (already full) buckets, and the oldest ones beyond max_keys."""
+        buckets = self._buckets
+        while buckets:
+            key, bucket = next(iter(buckets.items()))
+            if len(buckets) <= self.max_keys and now - bucket.updated < self._idle_after:
+                break
+            del buckets[key]
+            self._evictions += 1
+
+    def get_stats(self) -> dict:
+        return {"keys": len(self._buckets), "max_keys": self.max_keys, "evictions": self._evictions}
+
+
+def _load_backend(path: str) -> RateLimitBackend:
+    """Create a backend from a ``module:factory`` import path."""
+    module_name, _, factory = path.partition(":")
+    return getattr(importlib.import_module(module_name), factory)()
+
+
+_rules = parse_rules(RATE_LIMITS)
+_backend: RateLimitBackend = _load_backend(BACKEND) if BACKEND else MemoryBackend()
+_stats = {"allowed": 0, "limited": 0}
+_limited_by_rule: Dict[str, int] = {}
+
+
+def set_backend(backend: RateLimitBackend):
+    """
+    Replace the bucket storage backend.
+
+    Args:
+        backend: Backend instance
+    """
+    global _backend
+    _backend = backend
+
+
+def _match(method: str, path: str) -> Optional[RateLimitRule]:
+    """Find the first rule for a request."""
+    path = path.rstrip("/") or "/"
+    for rule in _rules:
+        if (rule.method == method or rule.method == "*") and rule.pattern.match(path):
+            return rule
+    return None
+
+
+def _client_ip(scope: dict) -> str:
+    """Client address, optionally taken from the proxy's X-Forwarded-For."""
+    if TRUST_FORWARDED:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                # The last address is the one added by the trusted proxy
+                return value.decode("latin-1").rsplit(",", 1)[-1].strip()
+
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _read_body(receive) -> Tuple[bytes, list]:
+    """
+    Read the request body so it can be inspected and then replayed.
+
+    Returns:
+        tuple: (body, received messages); body is empty if it was too large
+    """
+    messages = []
+    body = b""
+    more_body = True
+
+    while more_body:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if len(body) > MAX_BODY_BYTES:
+            return b"", messages
+
+    return body, messages
+
+
+def _crew_id(body: bytes) -> Optional[int]:
+    """
+    Extract the crew_id from a JSON body, if there is one.
+
+    The value is coerced like the request models do (lax pydantic ``int``),
+    so ``"1"`` and ``1.0`` share the bucket of ``1``.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or "crew_id" not in data:
+        return None
+    try:
+        return _CREW_ID.validate_python(data["crew_id"])
+    except ValidationError:
+        return None
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying the RATE_LIMITS rules before routing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        rule = _match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        keys = []
+        if "ip" in rule.keys:
+            keys.append((rule.index, "ip", _client_ip(scope)))
+
+        if "crew" in rule.keys:
+            body, messages = await _read_body(receive)
+            receive = _replay(messages, receive)
+            crew_id = _crew_id(body) if body else None
+            if crew_id is not None:
+                keys.append((rule.index, "crew", crew_id))
+            elif "ip" not in rule.keys:
+                # No usable crew_id (missing, invalid or body too large):
+                # limit by client IP so these requests are not unlimited
+                keys.append((rule.index, "ip", _client_ip(scope)))
+
+        for key in keys:
+            result = _backend.consume(key, rule.capacity, rule.refill_rate)
+            if inspect.isawaitable(result):
+                result = await result
+            allowed, retry_after = result
+
+            if not allowed:
+                _stats["limited"] += 1
+                _limited_by_rule[rule.name] = _limited_by_rule.get(rule.name, 0) + 1
+                retry_seconds = max(1, math.ceil(retry_after))
+                response = JSONResponse(
+                    status_code=429,
+                    content={"detail": f"Rate limit exceeded, retry in {retry_seconds} seconds"},
+                    headers={"Retry-After": str(retry_seconds)}
+                )
+                await response(scope, receive, send)
+                return
+
+        _stats["allowed"] += 1
+        await self.app(scope, receive, send)
+
+
+def _replay(messages: list, receive):
+    """Build a receive callable that returns already-read messages first."""
+    pending = list(messages)
+
+    async def replay():
+        if pending:
+            return pending.pop(0)
+        return await receive()
+
+    return replay
+
+
+def get_stats() -> dict:
+    """
+    Get rate limiter statistics.
+
+    Returns:
+        dict: Allowed/limited counters, configured rules and backend stats
+    """
+    return {
+        **_stats,
+        "enabled": RATE_LIMIT_ENABLED,
+        "rules": [f"{rule.name}={rule.limit}/{rule.period}s:{'+'.join(rule.keys)}" for rule in _rules],
+        "limited_by_rule": dict(_limited_by_rule),
+        "backend": {"type": type(_backend).__name__, **_backend.get_stats()},
+    }
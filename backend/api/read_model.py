@@ -0,0 +1,467 @@
+"""
+In-process materialised read model for the mission and experiment lists.
+
+When READ_MODEL_ENABLED is set, the joined mission/experiment rows are
+loaded once at startup into compact ``__slots__`` records. The write
+routes patch them in place, and list and detail reads (with filters and
+pagination) are served from memory. A periodic consistency check
+compares row counts and CRC32 checksums with MySQL and reloads on any
+mismatch; it runs as a job on api.scheduler.
+
+If the initial load fails, ``is_ready`` stays False and the routes keep
+querying MySQL directly.
+
+The model is per process: writes handled by another worker only show up
+after the next consistency check, so run_prod.py disables it when it
+starts more than one worker.
+"""
+
+import os
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+from api.database import execute_query
+
+# Read model configuration
+READ_MODEL_ENABLED = os.getenv("READ_MODEL_ENABLED", "false").lower() == "true"
+CONSISTENCY_CHECK_INTERVAL = float(os.getenv("READ_MODEL_CHECK_INTERVAL", "300"))
+
+# Attempts to load a snapshot that no concurrent write invalidated
+MAX_LOAD_ATTEMPTS = 3
+
+
+class MissionRecord:
+    """Compact in-memory mission row"""
+
+    __slots__ = ("mission_id", "name", "purpose", "crew_id")
+
+    def __init__(self, mission_id: int, name: str, purpose: str, crew_id: int):
+        self.mission_id = mission_id
+        self.name = name
+        self.purpose = purpose
+        self.crew_id = crew_id
+
+
+class ExperimentRecord:
+    """Compact in-memory experiment row"""
+
+    __slots__ = ("experiment_id", "title", "status", "crew_id")
+
+    def __init__(self, experiment_id: int, title: str, status: str, crew_id: int):
+        self.experiment_id = experiment_id
+        self.title = title
+        self.status = status
+        self.crew_id = crew_id
+
+
+# Table -> (record class, key column, columns in checksum order)
+TABLES = {
+    "mission": (MissionRecord, "mission_id", MissionRecord.__slots__),
+    "experiment": (ExperimentRecord, "experiment_id", ExperimentRecord.__slots__),
+}
+
+_crew_names: Dict[int, str] = {}
+_rows: Dict[str, dict] = {"mission": {}, "experiment": {}}
+_lock = threading.Lock()
+_ready = False
+_generation = 0
+_stats = {"loads": 0, "checks": 0, "mismatches": 0, "errors": 0}
+
+
+def is_enabled() -> bool:
+    """
+    Check whether the read model is configured.
+
+    Returns:
+        bool: True if READ_MODEL_ENABLED is set
+    """
+    return READ_MODEL_ENABLED
+
+
+def is_ready() -> bool:
+    """
+    Check whether reads can be served from memory.
+
+    Returns:
+        bool: True if the read model is enabled and loaded
+    """
+    return _ready
+
+
+def _fetch_snapshot():
+    """Read crew names and all mission/experiment rows from MySQL, in key order."""
+    crew = {
+        row["crew_id"]: row["name"]
+        for row in execute_query("SELECT crew_id, name FROM crew", fetch="all")
+    }
+
+    tables = {}
+    for table, (record_class, key, columns) in TABLES.items():
+        rows = execute_query(
+            f"SELECT {', '.join(columns)} FROM {table} ORDER BY {key}",
+            fetch="all"
+        )
+        tables[table] = {row[key]: record_class(**row) for row in rows}
+
+    return crew, tables
+
+
+def load():
+    """
+    Load (or reload) the read model from MySQL.
+
+    The snapshot is swapped in atomically. If a write is applied while the
+    snapshot is being read, the load is retried so that write is not lost.
+
+    Returns:
+        bool: True if a consistent snapshot was installed
+    """
+    global _crew_names, _rows, _ready
+
+    for _ in range(MAX_LOAD_ATTEMPTS):
+        generation = _generation
+        crew, tables = _fetch_snapshot()
+
+        with _lock:
+            if generation == _generation:
+                _crew_names = crew
+                _rows = tables
+                _ready = True
+                _stats["loads"] += 1
+                return True
+
+    return False
+
+
+def _fetch_record(table: str, key: int):
+    """Read one row from MySQL as a record, or None if it does not exist."""
+    record_class, key_column, columns = TABLES[table]
+    row = execute_query(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE {key_column} = %s",
+        (key,),
+        fetch="one"
+    )
+    return record_class(**row) if row else None
+
+
+def _patch(table: str, key: int, values: Optional[dict]):
+    """
+    Apply a single-row change; values=None deletes the row.
+
+    A partial update to a row that is not in memory (written by another
+    process, or already deleted) is resolved by reading the row from
+    MySQL, so a record is never built with missing columns.
+    """
+    global _generation
+
+    if not _ready:
+        return
+
+    record_class, key_column, columns = TABLES[table]
+
+    with _lock:
+        _generation += 1
+        rows = _rows[table]
+
+        if values is None:
+            rows.pop(key, None)
+            return
+
+        record = rows.get(key)
+        if record is not None:
+            for column, value in values.items():
+                setattr(record, column, value)
+            return
+
+        if all(column in values for column in columns if column != key_column):
+            full = {column: values[column] for column in columns if column != key_column}
+            rows[key] = record_class(**{**full, key_column: key})
+            return
+
+    try:
+        record = _fetch_record(table, key)
+    except Exception as e:
+        # Left to the next consistency check
+        _stats["errors"] += 1
+        print(f"Error loading {table} {key} into the read model: {e}")
+        return
+
+    with _lock:
+        _generation += 1
+        rows = _rows[table]
+        if record is not None and key not in rows:
+            rows[key] = record
+            if len(rows) > 1 and key < max(rows):
+                # Keep key order; list_rows relies on it for ID DESC
+                _rows[table] = dict(sorted(rows.items()))
+
+
+def upsert_mission(mission_id: int, values: dict):
+    """
+    Insert or update a mission in the read model.
+
+    Args:
+        mission_id: ID of the mission
+        values: Column values to set
+    """
+    _patch("mission", mission_id, values)
+
+
+def delete_mission(mission_id: int):
+    """
+    Remove a mission from the read model.
+
+    Args:
+        mission_id: ID of the mission
+    """
+    _patch("mission", mission_id, None)
+
+
+def upsert_experiment(experiment_id: int, values: dict):
+    """
+    Insert or update an experiment in the read model.
+
+    Args:
+        experiment_id: ID of the experiment
+        values: Column values to set
+    """
+    _patch("experiment", experiment_id, values)
+
+
+def delete_experiment(experiment_id: int):
+    """
+    Remove an experiment from the read model.
+
+    Args:
+        experiment_id: ID of the experiment
+    """
+    _patch("experiment", experiment_id, None)
+
+
+def _to_row(record, fields: List[str], crew_name: str) -> dict:
+    """Build a response dictionary with only the requested fields."""
+    return {
+        field: crew_name if field == "crew_name" else getattr(record, field)
+        for field in fields
+    }
+
+
+def list_rows(
+    table: str,
+    fields: List[str],
+    crew_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    status: Optional[str] = None,
+    status_overrides: Optional[Dict[int, str]] = None
+) -> list:
+    """
+    List rows joined with crew names, newest first.
+
+    Args:
+        table: "mission" or "experiment"
+        fields: Fields to include in each row
+        crew_id: Only rows assigned to this crew member
+        limit: Maximum number of rows
+        offset: Number of matching rows to skip
+        status: Only rows with this status (experiments)
+        status_overrides: Statuses by key that replace the stored ones when
+            filtering (queued write-behind updates)
+
+    Returns:
+        list: Row dictionaries
+    """
+    results = []
+    skipped = 0
+    overrides = status_overrides or {}
+
+    with _lock:
+        crew_names = _crew_names
+        # IDs are AUTO_INCREMENT and loaded in key order, so reverse
+        # insertion order is descending ID order
+        for record in reversed(_rows[table].values()):
+            if crew_id is not None and record.crew_id != crew_id:
+                continue
+            if status is not None and overrides.get(record.experiment_id, record.status) != status:
+                continue
+
+            crew_name = crew_names.get(record.crew_id)
+            if crew_name is None:
+                # Same as the INNER JOIN: rows without a crew member are hidden
+                continue
+
+            if skipped < offset:
+                skipped += 1
+                continue
+
+            results.append(_to_row(record, fields, crew_name))
+
+            if limit is not None and len(results) >= limit:
+                break
+
+    return results
+
+
+def get_row(table: str, key: int, fields: List[str]) -> Optional[dict]:
+    """
+    Get a single row joined with its crew name.
+
+    Args:
+        table: "mission" or "experiment"
+        key: Primary key value
+        fields: Fields to include
+
+    Returns:
+        Optional[dict]: Row dictionary, or None if not found
+    """
+    with _lock:
+        record = _rows[table].get(key)
+        if record is None:
+            return None
+
+        crew_name = _crew_names.get(record.crew_id)
+        if crew_name is None:
+            return None
+
+        return _to_row(record, fields, crew_name)
+
+
+def count_by_status(crew_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Count experiments per status.
+
+    Args:
+        crew_id: Only experiments assigned to this crew member
+
+    Returns:
+        Dict[str, int]: Number of experiments for each status present
+    """
+    counts: Dict[str, int] = {}
+
+    with _lock:
+        for record in _rows["experiment"].values():
+            if crew_id is not None and record.crew_id != crew_id:
+                continue
+            if record.crew_id not in _crew_names:
+                continue
+            counts[record.status] = counts.get(record.status, 0) + 1
+
+    return counts
+
+
+def _checksum(values_list) -> tuple:
+    """Row count and XOR of CRC32 over '|'-joined values, matching the SQL below."""
+    checksum = 0
+    count = 0
+    for values in values_list:
+        checksum ^= zlib.crc32("|".join(str(value) for value in values).encode("utf-8"))
+        count += 1
+    return count, checksum
+
+
+def _db_checksum(table: str, columns) -> tuple:
+    """Row count and checksum computed by MySQL."""
+    row = execute_query(
+        f"""
+            SELECT COUNT(*) AS row_count,
+                   COALESCE(BIT_XOR(CRC32(CONCAT_WS('|', {', '.join(columns)}))), 0) AS checksum
+            FROM {table}
+        """,
+        fetch="one"
+    )
+    return int(row["row_count"]), int(row["checksum"])
+
+
+def check_consistency() -> bool:
+    """
+    Compare the read model with MySQL and reload it on any mismatch.
+
+    Also retries the initial load if it has not succeeded yet.
+
+    Returns:
+        bool: True if the read model matched
+    """
+    if not _ready:
+        # The initial load failed; keep trying until the database is back
+        try:
+            load()
+        except Exception as e:
+            _stats["errors"] += 1
+            print(f"Error loading read model: {e}")
+        return False
+
+    _stats["checks"] += 1
+
+    try:
+        with _lock:
+            generation = _generation
+            local = {
+                "crew": _checksum((key, name) for key, name in _crew_names.items()),
+            }
+            for table, (_, _, columns) in TABLES.items():
+                local[table] = _checksum(
+                    [getattr(record, column) for column in columns]
+                    for record in _rows[table].values()
+                )
+
+        remote = {"crew": _db_checksum("crew", ("crew_id", "name"))}
+        for table, (_, _, columns) in TABLES.items():
+            remote[table] = _db_checksum(table, columns)
+
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"Error checking read model consistency: {e}")
+        return False
+
+    if local == remote:
+        return True
+
+    # A write between the two snapshots can cause a false alarm; only
+    # count it as drift when nothing was written in the meantime
+    if generation == _generation:
+        _stats["mismatches"] += 1
+        print("Read model out of sync with the database, reloading")
+
+    try:
+        load()
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"Error reloading read model: {e}")
+
+    return False
+
+
+def get_stats() -> dict:
+    """
+    Get read model statistics.
+
+    Returns:
+        dict: Row counts and load/check counters
+    """
+    with _lock:
+        return {
+            **_stats,
+            "enabled": READ_MODEL_ENABLED,
+            "ready": _ready,
+            "crew": len(_crew_names),
+            "missions": len(_rows["mission"]),
+            "experiments": len(_rows["experiment"]),
+        }
+
+
+def start():
+    """
+    Load the read model.
+
+    The periodic consistency check is run by the job scheduler (see
+    api/index.py); it also retries this load if it fails here.
+    """
+    if not READ_MODEL_ENABLED:
+        return
+
+    try:
+        load()
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"Error loading read model, serving reads from the database: {e}")
@@ -3,6 +3,6 @@ Routes package for Space Station Management System API.
 Contains all API route modules.
 """
 
-from . import auth, missions, experiments
+from . import auth, missions, experiments, crew, imports, history, jobs
 
-__all__ = ["auth", "missions", "experiments"]
+__all__ = ["auth", "missions", "experiments", "crew", "imports", "history", "jobs"]
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, status
 from api.models import LoginRequest, LoginResponse, ErrorResponse
-from api.database import execute_query
+from api.database import load_crew
+from api.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/login", tags=["Authentication"])
+router = APIRouter(prefix="/login", tags=["Authentication"], route_class=ProfiledRoute)
 
 
 @router.post(
@@ -28,14 +29,8 @@ async def login(credentials: LoginRequest):
         HTTPException: 401 if credentials are invalid, 500 for server errors
     """
     try:
-        # Query to validate credentials
-        query = """
-            SELECT crew_id, name, role, nationality, password
-            FROM crew
-            WHERE crew_id = %s
-        """
-        
-        result = execute_query(query, (credentials.crew_id,), fetch="one")
+        # Look up the crew member (batched with concurrent lookups)
+        result = await load_crew(credentials.crew_id)
         
         # Check if crew member exists
         if not result:
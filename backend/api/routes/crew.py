@@ -0,0 +1,193 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Dict, List
+from api.models import CrewDashboard, ErrorResponse
+from api.database import execute_query
+from api.profiling import ProfiledRoute
+from api import cache, write_behind
+
+router = APIRouter(prefix="/crew", tags=["Crew"], route_class=ProfiledRoute)
+
+# Upper bound on crew IDs accepted by the multi-crew dashboard
+MAX_DASHBOARD_IDS = 100
+
+
+def _load_dashboards(crew_ids: List[int]) -> Dict[int, dict]:
+    """
+    Load dashboards for several crew members with three batched queries.
+
+    Args:
+        crew_ids: Crew member IDs to load
+
+    Returns:
+        Dict[int, dict]: Dashboard data keyed by crew ID (unknown IDs are omitted)
+    """
+    token = cache.version_token("crew", "mission", "experiment")
+    dashboards = {}
+    missing = []
+
+    for crew_id in crew_ids:
+        cached = cache.get(("dashboard", crew_id, token))
+        if cached is not None:
+            dashboards[crew_id] = cached
+        else:
+            missing.append(crew_id)
+
+    if missing:
+        placeholders = ", ".join(["%s"] * len(missing))
+        params = tuple(missing)
+
+        crew_rows = execute_query(
+            f"""
+                SELECT crew_id, name, role, nationality
+                FROM crew
+                WHERE crew_id IN ({placeholders})
+            """,
+            params,
+            fetch="all"
+        )
+        loaded = {
+            row["crew_id"]: {"crew": row, "missions": [], "experiments": []}
+            for row in crew_rows
+        }
+
+        if loaded:
+            mission_rows = execute_query(
+                f"""
+                    SELECT mission_id, name, purpose, crew_id
+                    FROM mission
+                    WHERE crew_id IN ({placeholders})
+                    ORDER BY mission_id DESC
+                """,
+                params,
+                fetch="all"
+            )
+            experiment_rows = execute_query(
+                f"""
+                    SELECT experiment_id, title, status, crew_id
+                    FROM experiment
+                    WHERE crew_id IN ({placeholders})
+                    ORDER BY experiment_id DESC
+                """,
+                params,
+                fetch="all"
+            )
+
+            for row in mission_rows:
+                dashboard = loaded[row["crew_id"]]
+                row["crew_name"] = dashboard["crew"]["name"]
+                dashboard["missions"].append(row)
+
+            for row in experiment_rows:
+                dashboard = loaded[row["crew_id"]]
+                row["crew_name"] = dashboard["crew"]["name"]
+                dashboard["experiments"].append(row)
+
+        for crew_id, dashboard in loaded.items():
+            cache.put(("dashboard", crew_id, token), dashboard)
+            dashboards[crew_id] = dashboard
+
+    return dashboards
+
+
+def _build_dashboard(dashboard: dict) -> CrewDashboard:
+    """
+    Build a dashboard response, applying any queued experiment status updates.
+
+    Args:
+        dashboard: Cached dashboard data
+
+    Returns:
+        CrewDashboard: Dashboard response model
+    """
+    experiments = [dict(row) for row in dashboard["experiments"]]
+    write_behind.apply_overlay(experiments)
+
+    return CrewDashboard(
+        crew=dashboard["crew"],
+        missions=dashboard["missions"],
+        experiments=experiments
+    )
+
+
+@router.get(
+    "/dashboard",
+    response_model=List[CrewDashboard],
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_crew_dashboards(ids: List[int] = Query(..., description="Crew member IDs")):
+    """
+    Get dashboards for several crew members in one request.
+
+    Args:
+        ids: Crew member IDs (repeat the parameter: ?ids=1&ids=2)
+
+    Returns:
+        List[CrewDashboard]: Dashboards for the crew members that exist, in request order
+
+    Raises:
+        HTTPException: 400 if too many IDs are requested, 500 for server errors
+    """
+    if len(ids) > MAX_DASHBOARD_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_DASHBOARD_IDS} crew IDs can be requested at once"
+        )
+
+    try:
+        crew_ids = list(dict.fromkeys(ids))
+        dashboards = _load_dashboards(crew_ids)
+
+        return [_build_dashboard(dashboards[crew_id]) for crew_id in crew_ids if crew_id in dashboards]
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching crew dashboards: {str(e)}"
+        )
+
+
+@router.get(
+    "/{crew_id}/dashboard",
+    response_model=CrewDashboard,
+    status_code=status.HTTP_200_OK,
+    responses={
+        404: {"model": ErrorResponse, "description": "Crew member not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_crew_dashboard(crew_id: int):
+    """
+    Get a crew member's profile together with their missions and experiments.
+
+    Args:
+        crew_id: ID of the crew member
+
+    Returns:
+        CrewDashboard: Crew profile, missions and experiments
+
+    Raises:
+        HTTPException: 404 if crew member not found, 500 for server errors
+    """
+    try:
+        dashboards = _load_dashboards([crew_id])
+
+        if crew_id not in dashboards:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Crew member with ID {crew_id} not found"
+            )
+
+        return _build_dashboard(dashboards[crew_id])
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching crew dashboard: {str(e)}"
+        )
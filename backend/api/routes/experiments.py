@@ -1,16 +1,75 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from typing import List, Optional
 from api.models import (
     ExperimentCreate,
     ExperimentUpdate,
     ExperimentResponse,
     ExperimentCreateResponse,
+    ExperimentStatus,
+    ExperimentStatusCounts,
+    HistoryEntry,
     MessageResponse,
-    ErrorResponse
+    ErrorResponse,
+    is_status_transition_allowed
 )
-from api.database import execute_query
+from api.database import execute_query, build_update_query, crew_exists
+from api.projection import EXPERIMENT_FIELDS, parse_fields, build_select, build_list_filters, project
+from api.profiling import ProfiledRoute, phase
+from api import audit, cache, read_model, write_behind
 
-router = APIRouter(prefix="/experiments", tags=["Experiments"])
+router = APIRouter(prefix="/experiments", tags=["Experiments"], route_class=ProfiledRoute)
+
+# Columns that can be changed through PUT /experiments/{id}, in canonical order
+UPDATABLE_COLUMNS = ("title", "status", "crew_id")
+
+
+def _current_state(experiment_id: int) -> Optional[dict]:
+    """
+    Get an experiment's effective status, including any queued update, and crew member.
+    
+    Args:
+        experiment_id: ID of the experiment
+        
+    Returns:
+        Optional[dict]: ``status`` and ``crew_id``, or None if the experiment does not exist
+    """
+    if read_model.is_ready():
+        row = read_model.get_row("experiment", experiment_id, ["status", "crew_id"])
+    else:
+        row = execute_query(
+            "SELECT status, crew_id FROM experiment WHERE experiment_id = %s",
+            (experiment_id,),
+            fetch="one"
+        )
+    
+    if row is None:
+        return None
+    
+    pending = write_behind.pending_status(experiment_id)
+    if pending is not None:
+        row["status"] = pending
+    
+    return row
+
+
+def _check_transition(current_status: str, new_status: str):
+    """
+    Reject a status change not allowed by EXPERIMENT_STATUS_TRANSITIONS.
+    
+    Args:
+        current_status: Current status
+        new_status: Requested status
+        
+    Raises:
+        HTTPException: 400 if the change is not allowed
+    """
+    if not is_status_transition_allowed(current_status, new_status):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot change status from '{current_status}' to '{new_status}'"
+        )
 
 
 @router.get(
@@ -18,40 +77,227 @@ router = APIRouter(prefix="/experiments", tags=["Experiments"])
     response_model=List[ExperimentResponse],
     status_code=status.HTTP_200_OK,
     responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_experiments():
+async def get_experiments(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return: experiment_id, title, status, crew_id, crew_name"),
+    crew_id: Optional[int] = Query(None, description="Only experiments assigned to this crew member"),
+    status_filter: Optional[ExperimentStatus] = Query(None, alias="status", description="Only experiments with this status"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of experiments"),
+    offset: int = Query(0, ge=0, description="Number of experiments to skip")
+):
     """
     Get all experiments with crew member names using SQL JOIN.
     
+    When ``fields`` is given, only those columns are selected and returned,
+    and the crew JOIN is skipped unless ``crew_name`` is requested. When the
+    read model is enabled and loaded, results are served from memory.
+    
+    Args:
+        fields: Optional comma-separated list of fields to return
+        crew_id: Optional crew member filter
+        status_filter: Optional status filter (``status`` query parameter)
+        limit: Optional page size
+        offset: Number of rows to skip
+        
     Returns:
         List[ExperimentResponse]: List of all experiments with crew details
         
+    Raises:
+        HTTPException: 400 for unknown fields, 500 for server errors
+    """
+    try:
+        requested = parse_fields(fields, EXPERIMENT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    status_value = status_filter.value if status_filter is not None else None
+    # Filter on queued statuses too, and overlay the same snapshot, so
+    # every row returned matches the filter
+    overrides = write_behind.pending_statuses() if status_value is not None else None
+    
+    try:
+        if read_model.is_ready():
+            columns = list(requested or EXPERIMENT_FIELDS)
+            # The write-behind overlay needs the key to match rows
+            if "status" in columns and "experiment_id" not in columns:
+                columns.append("experiment_id")
+            
+            results = read_model.list_rows("experiment", columns, crew_id, limit, offset, status_value, overrides)
+            if "status" in columns:
+                write_behind.apply_overlay(results, overrides)
+            
+            if requested is not None:
+                return JSONResponse(content=project(results, requested))
+        else:
+            filters, params = build_list_filters(
+                "e", "experiment_id", crew_id, limit, offset, status_value, overrides
+            )
+            
+            if requested is not None:
+                query = build_select(
+                    requested, EXPERIMENT_FIELDS, "experiment", "e",
+                    key="experiment_id" if "status" in requested else None
+                ) + filters
+                results = execute_query(query, params, fetch="all")
+                if "status" in requested:
+                    write_behind.apply_overlay(results, overrides)
+                return JSONResponse(content=project(results, requested))
+            
+            query = """
+                SELECT 
+                    e.experiment_id,
+                    e.title,
+                    e.status,
+                    e.crew_id,
+                    c.name as crew_name
+                FROM experiment e
+                INNER JOIN crew c ON e.crew_id = c.crew_id
+            """ + filters
+            
+            results = execute_query(query, params, fetch="all")
+            write_behind.apply_overlay(results, overrides)
+        
+        with phase("model_build"):
+            return [ExperimentResponse(**row) for row in results]
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching experiments: {str(e)}"
+        )
+
+
+@router.get(
+    "/status-counts",
+    response_model=ExperimentStatusCounts,
+    status_code=status.HTTP_200_OK,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_experiment_status_counts(
+    crew_id: Optional[int] = Query(None, description="Only experiments assigned to this crew member")
+):
+    """
+    Count experiments per status.
+    
+    Served from the read model when it is loaded, otherwise with a
+    GROUP BY over the idx_experiment_status index.
+    
+    Args:
+        crew_id: Optional crew member filter
+        
+    Returns:
+        ExperimentStatusCounts: Count for every status (zero if none) and the total
+        
     Raises:
         HTTPException: 500 for server errors
     """
     try:
-        query = """
-            SELECT 
-                e.experiment_id,
-                e.title,
-                e.status,
-                e.crew_id,
-                c.name as crew_name
-            FROM experiment e
-            INNER JOIN crew c ON e.crew_id = c.crew_id
-            ORDER BY e.experiment_id DESC
-        """
+        if read_model.is_ready():
+            found = read_model.count_by_status(crew_id)
+        else:
+            query = "SELECT status, COUNT(*) AS count FROM experiment"
+            params = ()
+            if crew_id is not None:
+                query += " WHERE crew_id = %s"
+                params = (crew_id,)
+            query += " GROUP BY status"
+            
+            rows = execute_query(query, params, fetch="all")
+            found = {row["status"]: row["count"] for row in rows}
         
-        results = execute_query(query, fetch="all")
+        counts = {item.value: found.pop(item.value, 0) for item in ExperimentStatus}
+        # Unmigrated free-text values are reported as they are
+        counts.update(found)
         
-        return [ExperimentResponse(**row) for row in results]
+        return ExperimentStatusCounts(counts=counts, total=sum(counts.values()))
         
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error fetching experiments: {str(e)}"
+            detail=f"Error counting experiments: {str(e)}"
+        )
+
+
+@router.get(
+    "/{experiment_id}",
+    response_model=ExperimentResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        404: {"model": ErrorResponse, "description": "Experiment not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_experiment(
+    experiment_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return: experiment_id, title, status, crew_id, crew_name")
+):
+    """
+    Get a single experiment by ID.
+    
+    Args:
+        experiment_id: ID of the experiment
+        fields: Optional comma-separated list of fields to return
+        
+    Returns:
+        ExperimentResponse: Experiment details
+        
+    Raises:
+        HTTPException: 400 for unknown fields, 404 if not found, 500 for server errors
+    """
+    try:
+        requested = parse_fields(fields, EXPERIMENT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        if read_model.is_ready():
+            result = read_model.get_row("experiment", experiment_id, list(requested or EXPERIMENT_FIELDS))
+        else:
+            if requested is not None:
+                query = build_select(requested, EXPERIMENT_FIELDS, "experiment", "e") + " WHERE e.experiment_id = %s"
+            else:
+                query = """
+                    SELECT 
+                        e.experiment_id,
+                        e.title,
+                        e.status,
+                        e.crew_id,
+                        c.name as crew_name
+                    FROM experiment e
+                    INNER JOIN crew c ON e.crew_id = c.crew_id
+                    WHERE e.experiment_id = %s
+                """
+            
+            result = execute_query(query, (experiment_id,), fetch="one")
+        
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Experiment with ID {experiment_id} not found"
+            )
+        
+        pending = write_behind.pending_status(experiment_id)
+        if pending is not None and "status" in result:
+            result["status"] = pending
+        
+        if requested is not None:
+            return JSONResponse(content=project([result], requested)[0])
+        
+        return ExperimentResponse(**result)
+        
+    except HTTPException:
+        raise
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching experiment: {str(e)}"
         )
 
 
@@ -79,11 +325,8 @@ async def create_experiment(experiment: ExperimentCreate):
         HTTPException: 400 for invalid input, 404 if crew not found, 500 for server errors
     """
     try:
-        # Verify crew member exists
-        crew_check_query = "SELECT crew_id FROM crew WHERE crew_id = %s"
-        crew_exists = execute_query(crew_check_query, (experiment.crew_id,), fetch="one")
-        
-        if not crew_exists:
+        # Verify crew member exists (batched with concurrent lookups)
+        if not await crew_exists(experiment.crew_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Crew member with ID {experiment.crew_id} not found"
@@ -95,18 +338,20 @@ async def create_experiment(experiment: ExperimentCreate):
             VALUES (%s, %s, %s)
         """
         
-        execute_query(
+        experiment_id = execute_query(
             insert_query,
             (experiment.title, experiment.status, experiment.crew_id),
-            fetch="none"
+            fetch="lastrowid"
+        )
+        cache.bump_version("experiment")
+        read_model.upsert_experiment(experiment_id, experiment.model_dump())
+        audit.record(
+            "experiment", experiment_id, "create",
+            experiment.crew_id, audit.diff(None, experiment.model_dump())
         )
-        
-        # Get the last inserted ID
-        last_id_query = "SELECT LAST_INSERT_ID() as experiment_id"
-        result = execute_query(last_id_query, fetch="one")
         
         return ExperimentCreateResponse(
-            experiment_id=result["experiment_id"],
+            experiment_id=experiment_id,
             title=experiment.title,
             status=experiment.status,
             crew_id=experiment.crew_id
@@ -144,62 +389,82 @@ async def update_experiment(experiment_id: int, experiment: ExperimentUpdate):
         MessageResponse: Success message
         
     Raises:
-        HTTPException: 400 for invalid input, 404 if not found, 500 for server errors
+        HTTPException: 400 for invalid input or a status change not allowed by
+        EXPERIMENT_STATUS_TRANSITIONS, 404 if not found, 500 for server errors
     """
     try:
-        # Check if experiment exists
-        experiment_check_query = "SELECT experiment_id FROM experiment WHERE experiment_id = %s"
-        experiment_exists = execute_query(experiment_check_query, (experiment_id,), fetch="one")
+        # Status-only updates are queued and acknowledged immediately
+        # when write-behind mode is enabled
+        if (
+            write_behind.is_enabled()
+            and experiment.status is not None
+            and experiment.title is None
+            and experiment.crew_id is None
+        ):
+            current = _current_state(experiment_id)
+            
+            if current is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Experiment with ID {experiment_id} not found"
+                )
+            
+            _check_transition(current["status"], experiment.status)
+            
+            write_behind.enqueue_status(experiment_id, experiment.status, current["status"], current["crew_id"])
+            return MessageResponse(message=f"Experiment {experiment_id} status update queued")
+        
+        # Check if experiment exists (and keep its current values for the history diff)
+        experiment_check_query = "SELECT title, status, crew_id FROM experiment WHERE experiment_id = %s"
+        existing = execute_query(experiment_check_query, (experiment_id,), fetch="one")
         
-        if not experiment_exists:
+        if not existing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Experiment with ID {experiment_id} not found"
             )
         
-        # Build dynamic update query
-        update_fields = []
-        update_values = []
-        
-        if experiment.title is not None:
-            update_fields.append("title = %s")
-            update_values.append(experiment.title)
+        # Collect the fields being changed
+        changes = experiment.model_dump(exclude_none=True)
         
-        if experiment.status is not None:
-            update_fields.append("status = %s")
-            update_values.append(experiment.status)
-        
-        if experiment.crew_id is not None:
-            # Verify crew member exists
-            crew_check_query = "SELECT crew_id FROM crew WHERE crew_id = %s"
-            crew_exists = execute_query(crew_check_query, (experiment.crew_id,), fetch="one")
-            
-            if not crew_exists:
+        if "crew_id" in changes:
+            # Verify crew member exists (batched with concurrent lookups)
+            if not await crew_exists(experiment.crew_id):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Crew member with ID {experiment.crew_id} not found"
                 )
-            
-            update_fields.append("crew_id = %s")
-            update_values.append(experiment.crew_id)
         
-        if not update_fields:
+        if not changes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No fields to update"
             )
         
-        # Add experiment_id to values for WHERE clause
-        update_values.append(experiment_id)
-        
-        # Execute update
-        update_query = f"""
-            UPDATE experiment
-            SET {', '.join(update_fields)}
-            WHERE experiment_id = %s
-        """
+        if "status" in changes:
+            # A queued status update is the effective current status
+            _check_transition(
+                write_behind.pending_status(experiment_id) or existing["status"],
+                changes["status"]
+            )
         
-        execute_query(update_query, tuple(update_values), fetch="none")
+        # Execute update (one canonical statement shape for any set of fields)
+        update_query, update_params = build_update_query(
+            "experiment", "experiment_id", UPDATABLE_COLUMNS, changes, experiment_id
+        )
+        # Hold off write-behind flushes so an older queued status cannot be
+        # written over this update; the synchronous write supersedes it
+        with write_behind.flush_lock:
+            execute_query(update_query, update_params, fetch="none")
+            if experiment.status is not None:
+                write_behind.discard(experiment_id)
+            read_model.upsert_experiment(experiment_id, changes)
+        
+        cache.bump_version("experiment")
+        audit.record(
+            "experiment", experiment_id, "update",
+            changes.get("crew_id", existing["crew_id"]), audit.diff(existing, changes)
+        )
         
         return MessageResponse(message=f"Experiment {experiment_id} updated successfully")
         
@@ -236,11 +501,11 @@ async def delete_experiment(experiment_id: int):
         HTTPException: 404 if not found, 500 for server errors
     """
     try:
-        # Check if experiment exists
-        experiment_check_query = "SELECT experiment_id FROM experiment WHERE experiment_id = %s"
-        experiment_exists = execute_query(experiment_check_query, (experiment_id,), fetch="one")
+        # Check if experiment exists (and keep its current values for the history diff)
+        experiment_check_query = "SELECT title, status, crew_id FROM experiment WHERE experiment_id = %s"
+        existing = execute_query(experiment_check_query, (experiment_id,), fetch="one")
         
-        if not experiment_exists:
+        if not existing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Experiment with ID {experiment_id} not found"
@@ -248,7 +513,16 @@ async def delete_experiment(experiment_id: int):
         
         # Delete experiment
         delete_query = "DELETE FROM experiment WHERE experiment_id = %s"
-        execute_query(delete_query, (experiment_id,), fetch="none")
+        with write_behind.flush_lock:
+            execute_query(delete_query, (experiment_id,), fetch="none")
+            write_behind.discard(experiment_id)
+            read_model.delete_experiment(experiment_id)
+        
+        cache.bump_version("experiment")
+        audit.record(
+            "experiment", experiment_id, "delete",
+            existing["crew_id"], audit.diff(existing, None)
+        )
         
         return MessageResponse(message=f"Experiment {experiment_id} deleted successfully")
         
@@ -260,3 +534,46 @@ async def delete_experiment(experiment_id: int):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting experiment: {str(e)}"
         )
+
+
+@router.get(
+    "/{experiment_id}/history",
+    response_model=List[HistoryEntry],
+    status_code=status.HTTP_200_OK,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_experiment_history(
+    experiment_id: int,
+    since: Optional[datetime] = Query(None, description="Only changes at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Only changes before this time (UTC)"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Get the change history of an experiment, newest first.
+    
+    History is kept for deleted experiments too.
+    
+    Args:
+        experiment_id: ID of the experiment
+        since: Start of the time range (inclusive)
+        until: End of the time range (exclusive)
+        limit: Maximum number of entries
+        
+    Returns:
+        List[HistoryEntry]: Field diffs for each create, update and delete
+        
+    Raises:
+        HTTPException: 500 for server errors
+    """
+    try:
+        rows = audit.get_history("experiment", experiment_id, since, until, limit)
+        
+        return [HistoryEntry(**row) for row in rows]
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching experiment history: {str(e)}"
+        )
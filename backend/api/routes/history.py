@@ -0,0 +1,56 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import List, Optional
+from api.models import HistoryEntry, ErrorResponse
+from api.profiling import ProfiledRoute
+from api import audit
+
+router = APIRouter(prefix="/history", tags=["History"], route_class=ProfiledRoute)
+
+
+@router.get(
+    "",
+    response_model=List[HistoryEntry],
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_history(
+    entity: Optional[str] = Query(None, description="mission or experiment"),
+    since: Optional[datetime] = Query(None, description="Only changes at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Only changes before this time (UTC)"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Get changes across all missions and experiments in a time range, newest first.
+    
+    Args:
+        entity: Restrict to one entity type
+        since: Start of the time range (inclusive)
+        until: End of the time range (exclusive)
+        limit: Maximum number of entries
+        
+    Returns:
+        List[HistoryEntry]: Matching change records
+        
+    Raises:
+        HTTPException: 400 for an unknown entity, 500 for server errors
+    """
+    if entity is not None and entity not in ("mission", "experiment"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="entity must be 'mission' or 'experiment'"
+        )
+    
+    try:
+        rows = audit.get_history(entity, None, since, until, limit)
+        
+        return [HistoryEntry(**row) for row in rows]
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching change history: {str(e)}"
+        )
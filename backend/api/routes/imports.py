@@ -0,0 +1,73 @@
+import io
+import tempfile
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from starlette.concurrency import run_in_threadpool
+from api.models import ImportReport, ErrorResponse
+from api.profiling import ProfiledRoute
+from api import importer
+
+router = APIRouter(prefix="/import", tags=["Import"], route_class=ProfiledRoute)
+
+# Request bodies up to this size are buffered in memory, larger ones on disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+@router.post(
+    "",
+    response_model=ImportReport,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def import_data(
+    request: Request,
+    entity: str = Query(..., description="crew, mission or experiment"),
+    format: str = Query("csv", description="csv or ndjson"),
+    chunk_size: int = Query(importer.DEFAULT_CHUNK_SIZE, ge=1, le=10000)
+):
+    """
+    Bulk import records from a CSV or NDJSON request body.
+    
+    The body is streamed to a spooled temporary file and then parsed and
+    loaded in chunks on a worker thread, so large files neither block the
+    event loop nor need to fit in memory.
+    
+    Args:
+        request: Incoming request whose body is the file contents
+        entity: Type of record to import
+        format: File format
+        chunk_size: Rows per multi-row INSERT
+        
+    Returns:
+        ImportReport: Counts of read, inserted and rejected rows, with errors
+        
+    Raises:
+        HTTPException: 400 for an unsupported entity or format, 500 for server errors
+    """
+    if entity not in importer.ENTITIES or format not in importer.FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported entity or format (entity: {', '.join(importer.ENTITIES)}; format: {', '.join(importer.FORMATS)})"
+        )
+    
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as body:
+            async for data in request.stream():
+                body.write(data)
+            body.seek(0)
+            
+            stream = io.TextIOWrapper(body, encoding="utf-8-sig", newline="")
+            try:
+                return await run_in_threadpool(
+                    importer.import_stream, entity, stream, format, chunk_size
+                )
+            finally:
+                stream.detach()
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error importing {entity} records: {str(e)}"
+        )
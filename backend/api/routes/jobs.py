@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, status
+from api.models import JobsOverview, ErrorResponse
+from api.profiling import ProfiledRoute
+from api import scheduler
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=ProfiledRoute)
+
+
+@router.get(
+    "",
+    response_model=JobsOverview,
+    status_code=status.HTTP_200_OK,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_jobs():
+    """
+    Get the background job scheduler status.
+    
+    Returns:
+        JobsOverview: Scheduler counters and the status of scheduled,
+        running and recently finished jobs
+        
+    Raises:
+        HTTPException: 500 for server errors
+    """
+    try:
+        return JobsOverview(scheduler=scheduler.get_stats(), jobs=scheduler.get_jobs())
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching job status: {str(e)}"
+        )
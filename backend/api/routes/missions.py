@@ -1,16 +1,25 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from typing import List, Optional
 from api.models import (
     MissionCreate,
     MissionUpdate,
     MissionResponse,
     MissionCreateResponse,
+    HistoryEntry,
     MessageResponse,
     ErrorResponse
 )
-from api.database import execute_query
+from api.database import execute_query, build_update_query, crew_exists
+from api.projection import MISSION_FIELDS, parse_fields, build_select, build_list_filters, project
+from api.profiling import ProfiledRoute, phase
+from api import audit, cache, read_model
 
-router = APIRouter(prefix="/missions", tags=["Missions"])
+router = APIRouter(prefix="/missions", tags=["Missions"], route_class=ProfiledRoute)
+
+# Columns that can be changed through PUT /missions/{id}, in canonical order
+UPDATABLE_COLUMNS = ("name", "purpose", "crew_id")
 
 
 @router.get(
@@ -18,35 +27,70 @@ router = APIRouter(prefix="/missions", tags=["Missions"])
     response_model=List[MissionResponse],
     status_code=status.HTTP_200_OK,
     responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_missions():
+async def get_missions(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return: mission_id, name, purpose, crew_id, crew_name"),
+    crew_id: Optional[int] = Query(None, description="Only missions assigned to this crew member"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of missions"),
+    offset: int = Query(0, ge=0, description="Number of missions to skip")
+):
     """
     Get all missions with crew member names using SQL JOIN.
     
+    When ``fields`` is given, only those columns are selected and returned,
+    and the crew JOIN is skipped unless ``crew_name`` is requested. When the
+    read model is enabled and loaded, results are served from memory.
+    
+    Args:
+        fields: Optional comma-separated list of fields to return
+        crew_id: Optional crew member filter
+        limit: Optional page size
+        offset: Number of rows to skip
+        
     Returns:
         List[MissionResponse]: List of all missions with crew details
         
     Raises:
-        HTTPException: 500 for server errors
+        HTTPException: 400 for unknown fields, 500 for server errors
     """
     try:
-        query = """
-            SELECT 
-                m.mission_id,
-                m.name,
-                m.purpose,
-                m.crew_id,
-                c.name as crew_name
-            FROM mission m
-            INNER JOIN crew c ON m.crew_id = c.crew_id
-            ORDER BY m.mission_id DESC
-        """
-        
-        results = execute_query(query, fetch="all")
+        requested = parse_fields(fields, MISSION_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        if read_model.is_ready():
+            columns = list(requested or MISSION_FIELDS)
+            results = read_model.list_rows("mission", columns, crew_id, limit, offset)
+            
+            if requested is not None:
+                return JSONResponse(content=project(results, requested))
+        else:
+            filters, params = build_list_filters("m", "mission_id", crew_id, limit, offset)
+            
+            if requested is not None:
+                query = build_select(requested, MISSION_FIELDS, "mission", "m") + filters
+                results = execute_query(query, params, fetch="all")
+                return JSONResponse(content=project(results, requested))
+            
+            query = """
+                SELECT 
+                    m.mission_id,
+                    m.name,
+                    m.purpose,
+                    m.crew_id,
+                    c.name as crew_name
+                FROM mission m
+                INNER JOIN crew c ON m.crew_id = c.crew_id
+            """ + filters
+            
+            results = execute_query(query, params, fetch="all")
         
-        return [MissionResponse(**row) for row in results]
+        with phase("model_build"):
+            return [MissionResponse(**row) for row in results]
         
     except Exception as e:
         raise HTTPException(
@@ -55,6 +99,80 @@ async def get_missions():
         )
 
 
+@router.get(
+    "/{mission_id}",
+    response_model=MissionResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        404: {"model": ErrorResponse, "description": "Mission not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_mission(
+    mission_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return: mission_id, name, purpose, crew_id, crew_name")
+):
+    """
+    Get a single mission by ID.
+    
+    Args:
+        mission_id: ID of the mission
+        fields: Optional comma-separated list of fields to return
+        
+    Returns:
+        MissionResponse: Mission details
+        
+    Raises:
+        HTTPException: 400 for unknown fields, 404 if not found, 500 for server errors
+    """
+    try:
+        requested = parse_fields(fields, MISSION_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        if read_model.is_ready():
+            result = read_model.get_row("mission", mission_id, list(requested or MISSION_FIELDS))
+        else:
+            if requested is not None:
+                query = build_select(requested, MISSION_FIELDS, "mission", "m") + " WHERE m.mission_id = %s"
+            else:
+                query = """
+                    SELECT 
+                        m.mission_id,
+                        m.name,
+                        m.purpose,
+                        m.crew_id,
+                        c.name as crew_name
+                    FROM mission m
+                    INNER JOIN crew c ON m.crew_id = c.crew_id
+                    WHERE m.mission_id = %s
+                """
+            
+            result = execute_query(query, (mission_id,), fetch="one")
+        
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Mission with ID {mission_id} not found"
+            )
+        
+        if requested is not None:
+            return JSONResponse(content=project([result], requested)[0])
+        
+        return MissionResponse(**result)
+        
+    except HTTPException:
+        raise
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching mission: {str(e)}"
+        )
+
+
 @router.post(
     "",
     response_model=MissionCreateResponse,
@@ -79,11 +197,8 @@ async def create_mission(mission: MissionCreate):
         HTTPException: 400 for invalid input, 404 if crew not found, 500 for server errors
     """
     try:
-        # Verify crew member exists
-        crew_check_query = "SELECT crew_id FROM crew WHERE crew_id = %s"
-        crew_exists = execute_query(crew_check_query, (mission.crew_id,), fetch="one")
-        
-        if not crew_exists:
+        # Verify crew member exists (batched with concurrent lookups)
+        if not await crew_exists(mission.crew_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Crew member with ID {mission.crew_id} not found"
@@ -95,18 +210,20 @@ async def create_mission(mission: MissionCreate):
             VALUES (%s, %s, %s)
         """
         
-        execute_query(
+        mission_id = execute_query(
             insert_query,
             (mission.name, mission.purpose, mission.crew_id),
-            fetch="none"
+            fetch="lastrowid"
+        )
+        cache.bump_version("mission")
+        read_model.upsert_mission(mission_id, mission.model_dump())
+        audit.record(
+            "mission", mission_id, "create",
+            mission.crew_id, audit.diff(None, mission.model_dump())
         )
-        
-        # Get the last inserted ID
-        last_id_query = "SELECT LAST_INSERT_ID() as mission_id"
-        result = execute_query(last_id_query, fetch="one")
         
         return MissionCreateResponse(
-            mission_id=result["mission_id"],
+            mission_id=mission_id,
             name=mission.name,
             purpose=mission.purpose,
             crew_id=mission.crew_id
@@ -147,59 +264,44 @@ async def update_mission(mission_id: int, mission: MissionUpdate):
         HTTPException: 400 for invalid input, 404 if not found, 500 for server errors
     """
     try:
-        # Check if mission exists
-        mission_check_query = "SELECT mission_id FROM mission WHERE mission_id = %s"
-        mission_exists = execute_query(mission_check_query, (mission_id,), fetch="one")
+        # Check if mission exists (and keep its current values for the history diff)
+        mission_check_query = "SELECT name, purpose, crew_id FROM mission WHERE mission_id = %s"
+        existing = execute_query(mission_check_query, (mission_id,), fetch="one")
         
-        if not mission_exists:
+        if not existing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Mission with ID {mission_id} not found"
             )
         
-        # Build dynamic update query
-        update_fields = []
-        update_values = []
-        
-        if mission.name is not None:
-            update_fields.append("name = %s")
-            update_values.append(mission.name)
-        
-        if mission.purpose is not None:
-            update_fields.append("purpose = %s")
-            update_values.append(mission.purpose)
+        # Collect the fields being changed
+        changes = mission.model_dump(exclude_none=True)
         
-        if mission.crew_id is not None:
-            # Verify crew member exists
-            crew_check_query = "SELECT crew_id FROM crew WHERE crew_id = %s"
-            crew_exists = execute_query(crew_check_query, (mission.crew_id,), fetch="one")
-            
-            if not crew_exists:
+        if "crew_id" in changes:
+            # Verify crew member exists (batched with concurrent lookups)
+            if not await crew_exists(mission.crew_id):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Crew member with ID {mission.crew_id} not found"
                 )
-            
-            update_fields.append("crew_id = %s")
-            update_values.append(mission.crew_id)
         
-        if not update_fields:
+        if not changes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No fields to update"
             )
         
-        # Add mission_id to values for WHERE clause
-        update_values.append(mission_id)
-        
-        # Execute update
-        update_query = f"""
-            UPDATE mission
-            SET {', '.join(update_fields)}
-            WHERE mission_id = %s
-        """
-        
-        execute_query(update_query, tuple(update_values), fetch="none")
+        # Execute update (one canonical statement shape for any set of fields)
+        update_query, update_params = build_update_query(
+            "mission", "mission_id", UPDATABLE_COLUMNS, changes, mission_id
+        )
+        execute_query(update_query, update_params, fetch="none")
+        cache.bump_version("mission")
+        read_model.upsert_mission(mission_id, changes)
+        audit.record(
+            "mission", mission_id, "update",
+            changes.get("crew_id", existing["crew_id"]), audit.diff(existing, changes)
+        )
         
         return MessageResponse(message=f"Mission {mission_id} updated successfully")
         
@@ -236,11 +338,11 @@ async def delete_mission(mission_id: int):
         HTTPException: 404 if not found, 500 for server errors
     """
     try:
-        # Check if mission exists
-        mission_check_query = "SELECT mission_id FROM mission WHERE mission_id = %s"
-        mission_exists = execute_query(mission_check_query, (mission_id,), fetch="one")
+        # Check if mission exists (and keep its current values for the history diff)
+        mission_check_query = "SELECT name, purpose, crew_id FROM mission WHERE mission_id = %s"
+        existing = execute_query(mission_check_query, (mission_id,), fetch="one")
         
-        if not mission_exists:
+        if not existing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Mission with ID {mission_id} not found"
@@ -249,6 +351,12 @@ async def delete_mission(mission_id: int):
         # Delete mission
         delete_query = "DELETE FROM mission WHERE mission_id = %s"
         execute_query(delete_query, (mission_id,), fetch="none")
+        cache.bump_version("mission")
+        read_model.delete_mission(mission_id)
+        audit.record(
+            "mission", mission_id, "delete",
+            existing["crew_id"], audit.diff(existing, None)
+        )
         
         return MessageResponse(message=f"Mission {mission_id} deleted successfully")
         
@@ -260,3 +368,46 @@ async def delete_mission(mission_id: int):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting mission: {str(e)}"
         )
+
+
+@router.get(
+    "/{mission_id}/history",
+    response_model=List[HistoryEntry],
+    status_code=status.HTTP_200_OK,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_mission_history(
+    mission_id: int,
+    since: Optional[datetime] = Query(None, description="Only changes at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Only changes before this time (UTC)"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Get the change history of a mission, newest first.
+    
+    History is kept for deleted missions too.
+    
+    Args:
+        mission_id: ID of the mission
+        since: Start of the time range (inclusive)
+        until: End of the time range (exclusive)
+        limit: Maximum number of entries
+        
+    Returns:
+        List[HistoryEntry]: Field diffs for each create, update and delete
+        
+    Raises:
+        HTTPException: 500 for server errors
+    """
+    try:
+        rows = audit.get_history("mission", mission_id, since, until, limit)
+        
+        return [HistoryEntry(**row) for row in rows]
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching mission history: {str(e)}"
+        )
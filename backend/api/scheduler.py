@@ -0,0 +1,378 @@
+"""
+In-process background job scheduler.
+
+Periodic and one-off jobs run on a small thread pool owned by the
+scheduler, so they never block the event loop or take a request's
+worker. The scheduling loop is an asyncio task started from the FastAPI
+lifespan. It only dispatches a job when a pool slot is free, and a
+periodic job is never run twice at once. A run that comes due while the
+previous one is still going is counted as skipped.
+
+Periodic runs get random jitter added to their interval, so several
+worker processes started together (see run_prod.py) do not all hit the
+database at the same moment.
+
+Jobs are plain synchronous callables, like the rest of the data layer.
+Exceptions are caught, counted and printed; they never stop the
+scheduler.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+# Scheduler configuration
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+MAX_WORKERS = int(os.getenv("SCHEDULER_WORKERS") or 2)
+MAX_QUEUED = int(os.getenv("SCHEDULER_MAX_QUEUED") or 100)
+
+# Default jitter as a fraction of the interval
+DEFAULT_JITTER = 0.1
+
+# Finished one-off jobs kept for /jobs
+MAX_FINISHED = 50
+
+
+class Job:
+    """A scheduled job and its run statistics"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], object],
+        interval: Optional[float],
+        jitter: float,
+        next_run: float
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.next_run = next_run
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_seconds = 0.0
+        self.last_started: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.last_result: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def periodic(self) -> bool:
+        return self.interval is not None
+
+    def to_dict(self, now: float) -> dict:
+        """Status dictionary for /jobs."""
+        finished = self.runs > 0 and not self.running and not self.periodic
+        return {
+            "name": self.name,
+            "kind": "periodic" if self.periodic else "once",
+            "interval_seconds": self.interval,
+            "jitter_seconds": self.jitter,
+            "running": self.running,
+            "next_run_in": None if finished or self.running else round(max(self.next_run - now, 0.0), 3),
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "average_seconds": round(self.total_seconds / self.runs, 4) if self.runs else None,
+            "last_started": self.last_started,
+            "last_duration": self.last_duration,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+_jobs: Dict[str, Job] = {}
+_finished: Dict[str, Job] = {}
+_lock = threading.Lock()
+_stats = {"dispatched": 0, "completed": 0, "failed": 0, "skipped": 0, "rejected": 0}
+_in_flight = 0
+_executor: Optional[ThreadPoolExecutor] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_task: Optional[asyncio.Task] = None
+_wakeup: Optional[asyncio.Event] = None
+_one_off_counter = 0
+
+
+def is_running() -> bool:
+    """
+    Check whether the scheduler loop is running.
+
+    Returns:
+        bool: True between ``start`` and ``shutdown``
+    """
+    return _task is not None and not _task.done()
+
+
+def _notify():
+    """Wake the scheduling loop (safe to call from any thread)."""
+    if _loop is not None and _wakeup is not None:
+        try:
+            _loop.call_soon_threadsafe(_wakeup.set)
+        except RuntimeError:
+            # Event loop already closed during shutdown
+            pass
+
+
+def schedule(
+    name: str,
+    func: Callable[[], object],
+    interval: float,
+    jitter: Optional[float] = None,
+    initial_delay: Optional[float] = None
+):
+    """
+    Register a periodic job.
+
+    Args:
+        name: Unique job name (shown in /jobs)
+        func: Callable run on the worker pool
+        interval: Seconds between runs
+        jitter: Maximum random delay added to each run (default 10% of interval)
+        initial_delay: Seconds before the first run (default one interval)
+
+    Raises:
+        ValueError: If the name is taken or the interval is not positive
+    """
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+
+    if jitter is None:
+        jitter = interval * DEFAULT_JITTER
+    if initial_delay is None:
+        initial_delay = interval
+
+    with _lock:
+        if name in _jobs:
+            raise ValueError(f"Job '{name}' is already scheduled")
+        _jobs[name] = Job(
+            name, func, interval, jitter,
+            time.monotonic() + initial_delay + random.uniform(0, jitter)
+        )
+
+    _notify()
+
+
+def submit(name: str, func: Callable[[], object], delay: float = 0.0) -> str:
+    """
+    Queue a one-off job.
+
+    Args:
+        name: Job name; a sequence number is appended to keep it unique
+        func: Callable run on the worker pool
+        delay: Seconds to wait before running
+
+    Returns:
+        str: Unique name of the queued job
+
+    Raises:
+        RuntimeError: If MAX_QUEUED one-off jobs are already waiting
+    """
+    global _one_off_counter
+
+    with _lock:
+        queued = sum(1 for job in _jobs.values() if not job.periodic and not job.running)
+        if queued >= MAX_QUEUED:
+            _stats["rejected"] += 1
+            raise RuntimeError(f"Job queue is full ({MAX_QUEUED} jobs waiting)")
+
+        _one_off_counter += 1
+        unique_name = f"{name}#{_one_off_counter}"
+        _jobs[unique_name] = Job(unique_name, func, None, 0.0, time.monotonic() + delay)
+
+    _notify()
+    return unique_name
+
+
+def unschedule(name: str) -> bool:
+    """
+    Remove a job that has not started yet, or stop a periodic job from repeating.
+
+    Args:
+        name: Job name
+
+    Returns:
+        bool: True if the job was found
+    """
+    with _lock:
+        return _jobs.pop(name, None) is not None
+
+
+def _run_job(job: Job):
+    """Run a job on a worker thread and record its outcome."""
+    started = time.perf_counter()
+    job.last_started = datetime.now(timezone.utc)
+
+    try:
+        result = job.func()
+        error = None
+    except Exception as e:
+        result = None
+        error = str(e)
+        print(f"Error running job {job.name}: {e}")
+
+    duration = time.perf_counter() - started
+
+    with _lock:
+        job.runs += 1
+        job.total_seconds += duration
+        job.last_duration = round(duration, 4)
+        job.last_result = None if result is None else str(result)
+        job.last_error = error
+        if error is None:
+            _stats["completed"] += 1
+        else:
+            job.failures += 1
+            _stats["failed"] += 1
+
+
+def _on_done(job: Job):
+    """Release the job's pool slot and reschedule or retire it."""
+    global _in_flight
+
+    with _lock:
+        _in_flight -= 1
+        job.running = False
+
+        if job.periodic:
+            job.next_run = time.monotonic() + job.interval + random.uniform(0, job.jitter)
+        else:
+            _jobs.pop(job.name, None)
+            _finished[job.name] = job
+            while len(_finished) > MAX_FINISHED:
+                _finished.pop(next(iter(_finished)))
+
+    _notify()
+
+
+def _dispatch_due(now: float) -> Optional[float]:
+    """
+    Start every due job that has a free pool slot.
+
+    Returns:
+        Optional[float]: Seconds until the next job is due, or None if idle
+    """
+    global _in_flight
+
+    to_start = []
+    next_due = None
+
+    with _lock:
+        for job in sorted(_jobs.values(), key=lambda item: item.next_run):
+            if job.running:
+                if job.periodic and job.next_run <= now:
+                    # Still running from last time; don't overlap
+                    job.skipped += 1
+                    _stats["skipped"] += 1
+                    job.next_run = now + job.interval + random.uniform(0, job.jitter)
+                if job.periodic:
+                    next_due = job.next_run if next_due is None else min(next_due, job.next_run)
+                continue
+
+            if job.next_run > now:
+                next_due = job.next_run if next_due is None else min(next_due, job.next_run)
+                continue
+
+            if _in_flight >= MAX_WORKERS:
+                # Pool is busy; wait for a slot to free up (_on_done wakes us)
+                continue
+
+            job.running = True
+            if job.periodic:
+                # Next slot; only reached while running if the run overruns
+                job.next_run = now + job.interval + random.uniform(0, job.jitter)
+                next_due = job.next_run if next_due is None else min(next_due, job.next_run)
+            _in_flight += 1
+            _stats["dispatched"] += 1
+            to_start.append(job)
+
+    for job in to_start:
+        future = _loop.run_in_executor(_executor, _run_job, job)
+        future.add_done_callback(lambda _, job=job: _on_done(job))
+
+    return None if next_due is None else max(next_due - now, 0.0)
+
+
+async def _run_loop():
+    """Scheduling loop: sleep until the next job is due or the schedule changes."""
+    while True:
+        timeout = _dispatch_due(time.monotonic())
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start():
+    """Start the scheduling loop on the running event loop."""
+    global _executor, _loop, _task, _wakeup
+
+    if not SCHEDULER_ENABLED or is_running():
+        return
+
+    _loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+    _task = asyncio.create_task(_run_loop())
+
+
+async def shutdown():
+    """Stop scheduling new runs, wait for running jobs and clear the schedule."""
+    global _task, _executor
+
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+    if _executor is not None:
+        executor = _executor
+        _executor = None
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    # One-off jobs that never started are dropped; periodic jobs are
+    # registered again on the next start-up
+    with _lock:
+        _jobs.clear()
+
+
+def get_jobs() -> list:
+    """
+    Get the status of scheduled, running and recently finished jobs.
+
+    Returns:
+        list: Job status dictionaries, periodic jobs first
+    """
+    now = time.monotonic()
+    with _lock:
+        jobs = list(_jobs.values()) + list(reversed(_finished.values()))
+        return [job.to_dict(now) for job in sorted(jobs, key=lambda item: not item.periodic)]
+
+
+def get_stats() -> dict:
+    """
+    Get scheduler statistics.
+
+    Returns:
+        dict: Dispatch counters, pool size and current load
+    """
+    with _lock:
+        return {
+            **_stats,
+            "enabled": SCHEDULER_ENABLED,
+            "running": is_running(),
+            "workers": MAX_WORKERS,
+            "in_flight": _in_flight,
+            "scheduled": len(_jobs),
+        }
@@ -0,0 +1,315 @@
+"""
+Write-behind queue for experiment status updates.
+
+Status-only updates are acknowledged immediately and coalesced per
+experiment ID (last write wins). A background worker flushes pending
+updates to MySQL in batches, bounded by a maximum delay and a maximum
+number of pending entries. Pending values are served back to readers
+through an overlay so clients always see their own writes.
+
+Synchronous writes to an experiment's status hold ``flush_lock`` while
+they write and discard the queued value, so an in-flight flush can never
+commit an older status over them.
+
+The queue is per process. Each update remembers the stored status it was
+checked against, and the flush only applies it while the row still has
+that status. If another worker (or a direct write) changed the status in
+the meantime, the queued update is dropped and counted as a conflict,
+rather than overwriting a newer status.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+from api.database import execute_query, pad_keys
+from api import audit, cache, read_model
+
+# Write-behind configuration
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "false").lower() == "true"
+FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "1.0"))
+MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "1000"))
+BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "500"))
+
+
+
+class _Update:
+    """A queued status, the stored status it was checked against, and the row's crew member"""
+
+    __slots__ = ("status", "expected", "crew_id")
+
+    def __init__(self, status: str, expected: str, crew_id: Optional[int]):
+        self.status = status
+        self.expected = expected
+        self.crew_id = crew_id
+
+
+_pending: Dict[int, _Update] = {}
+_lock = threading.Lock()
+# Held for a whole flush, and by synchronous writes that supersede queued values
+flush_lock = threading.Lock()
+_wakeup = threading.Event()
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+_stats = {
+    "enqueued": 0, "coalesced": 0, "flushed": 0, "batches": 0,
+    "conflicts": 0, "errors": 0, "backpressure": 0
+}
+
+
+def is_enabled() -> bool:
+    """
+    Check whether write-behind mode is active.
+
+    Returns:
+        bool: True if status updates should be queued
+    """
+    return WRITE_BEHIND_ENABLED
+
+
+def enqueue_status(experiment_id: int, status: str, current_status: str, crew_id: Optional[int]):
+    """
+    Queue a status update for an experiment.
+
+    Args:
+        experiment_id: ID of the experiment to update
+        status: New status value
+        current_status: Status the change was checked against. Unless an
+            update is already queued, the flush only applies the new status
+            while the stored status still equals this.
+        crew_id: Crew member assigned to the experiment (for the change history)
+
+    Raises:
+        RuntimeError: If the queue is full and could not be flushed
+    """
+    with _lock:
+        full = experiment_id not in _pending and len(_pending) >= MAX_PENDING
+
+    if full:
+        # Backpressure: the caller waits for a flush instead of the queue
+        # growing past MAX_PENDING
+        _stats["backpressure"] += 1
+        flush()
+
+    with _lock:
+        if experiment_id not in _pending and len(_pending) >= MAX_PENDING:
+            # The flush failed; reject rather than exceed the bound
+            raise RuntimeError(f"Write-behind queue is full ({MAX_PENDING} pending updates)")
+        queued = _pending.get(experiment_id)
+        if queued is not None:
+            # Coalesce, still expecting the status stored before the first update
+            _stats["coalesced"] += 1
+            current_status = queued.expected
+        _pending[experiment_id] = _Update(status, current_status, crew_id)
+        _stats["enqueued"] += 1
+
+    _ensure_worker()
+
+
+def discard(experiment_id: int):
+    """
+    Drop any pending status update for an experiment.
+
+    Called when a synchronous write supersedes the queued value
+    (a full update or a delete), while holding ``flush_lock``.
+
+    Args:
+        experiment_id: ID of the experiment
+    """
+    with _lock:
+        _pending.pop(experiment_id, None)
+
+
+def pending_status(experiment_id: int) -> Optional[str]:
+    """
+    Get the queued status for an experiment, if any.
+
+    Args:
+        experiment_id: ID of the experiment
+
+    Returns:
+        Optional[str]: Pending status or None
+    """
+    with _lock:
+        queued = _pending.get(experiment_id)
+        return queued.status if queued is not None else None
+
+
+def pending_statuses() -> Dict[int, str]:
+    """
+    Get all queued statuses.
+
+    Returns:
+        Dict[int, str]: Pending status by experiment ID (a copy)
+    """
+    with _lock:
+        return {experiment_id: queued.status for experiment_id, queued in _pending.items()}
+
+
+def apply_overlay(rows: list, overlay: Optional[Dict[int, str]] = None) -> list:
+    """
+    Overlay pending status updates onto experiment rows in place.
+
+    Args:
+        rows: List of experiment row dictionaries
+        overlay: Snapshot from ``pending_statuses`` to apply (default: the
+            current queue)
+
+    Returns:
+        list: The same rows with pending statuses applied
+    """
+    if overlay is None:
+        if not _pending:
+            return rows
+        overlay = pending_statuses()
+
+    for row in rows:
+        status = overlay.get(row["experiment_id"])
+        if status is not None:
+            row["status"] = status
+
+    return rows
+
+
+def flush():
+    """
+    Write all pending status updates to the database in batches.
+
+    Returns:
+        int: Number of updates written
+    """
+    with flush_lock:
+        return _flush_locked()
+
+
+def _flush_locked() -> int:
+    """Flush pending updates; the caller holds flush_lock."""
+    with _lock:
+        batch = dict(_pending)
+
+    if not batch:
+        return 0
+
+    items = []
+    with _lock:
+        for experiment_id, queued in batch.items():
+            if queued.status == queued.expected:
+                # Changed back before it was flushed; nothing to write
+                if _pending.get(experiment_id) is queued:
+                    del _pending[experiment_id]
+            else:
+                items.append((experiment_id, queued))
+
+    written = 0
+
+    for start in range(0, len(items), BATCH_SIZE):
+        chunk = items[start:start + BATCH_SIZE]
+        # Repeating the last update keeps the statement in a few cached shapes
+        padded = pad_keys(chunk)
+        ids = [experiment_id for experiment_id, _ in padded]
+        cases = " ".join("WHEN %s THEN %s" for _ in padded)
+        placeholders = ", ".join("%s" for _ in padded)
+        # Only rows still holding the status each update was checked against
+        query = f"""
+            UPDATE experiment
+            SET status = CASE experiment_id {cases} END
+            WHERE experiment_id IN ({placeholders})
+            AND status = CASE experiment_id {cases} END
+        """
+        params = [value for experiment_id, queued in padded for value in (experiment_id, queued.status)]
+        params.extend(ids)
+        params.extend(value for experiment_id, queued in padded for value in (experiment_id, queued.expected))
+
+        try:
+            updated = execute_query(query, tuple(params), fetch="rowcount")
+            applied = chunk
+            if updated != len(chunk):
+                # Some rows were changed elsewhere since they were queued
+                rows = execute_query(
+                    f"SELECT experiment_id, status FROM experiment WHERE experiment_id IN ({placeholders})",
+                    tuple(ids),
+                    fetch="all"
+                )
+                stored = {row["experiment_id"]: row["status"] for row in rows}
+                applied = [
+                    (experiment_id, queued) for experiment_id, queued in chunk
+                    if stored.get(experiment_id) == queued.status
+                ]
+        except Exception as e:
+            _stats["errors"] += 1
+            print(f"Error flushing experiment status updates: {e}")
+            break
+
+        with _lock:
+            # Applied and conflicting entries are both done with, unless
+            # they were overwritten while flushing
+            for experiment_id, queued in chunk:
+                if _pending.get(experiment_id) is queued:
+                    del _pending[experiment_id]
+            for experiment_id, queued in applied:
+                newer = _pending.get(experiment_id)
+                if newer is not None and newer is not queued:
+                    # Queued on top of this one; it now builds on the flushed status
+                    newer.expected = queued.status
+            _stats["flushed"] += len(applied)
+            _stats["conflicts"] += len(chunk) - len(applied)
+            _stats["batches"] += 1
+
+        # The conditional UPDATE guarantees the row held queued.expected
+        for experiment_id, queued in applied:
+            read_model.upsert_experiment(experiment_id, {"status": queued.status})
+            audit.record(
+                "experiment", experiment_id, "update",
+                queued.crew_id, {"status": [queued.expected, queued.status]}
+            )
+
+        written += len(applied)
+
+    if written:
+        cache.bump_version("experiment")
+
+    return written
+
+
+def get_stats() -> dict:
+    """
+    Get write-behind queue statistics.
+
+    Returns:
+        dict: Queue counters and current backlog
+    """
+    with _lock:
+        return {**_stats, "pending": len(_pending), "enabled": WRITE_BEHIND_ENABLED}
+
+
+def _run():
+    """Background worker loop: flush on interval or when woken by backpressure."""
+    while not _stop.is_set():
+        _wakeup.wait(FLUSH_INTERVAL)
+        _wakeup.clear()
+        flush()
+
+
+def _ensure_worker():
+    """Start the background flush worker if it is not running."""
+    global _worker
+
+    if _worker is not None and _worker.is_alive():
+        return
+
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _stop.clear()
+            _worker = threading.Thread(target=_run, name="write-behind", daemon=True)
+            _worker.start()
+
+
+def shutdown():
+    """Stop the background worker and flush any remaining updates."""
+    _stop.set()
+    _wakeup.set()
+
+    if _worker is not None:
+        _worker.join(timeout=FLUSH_INTERVAL + 5)
+
+    flush()
@@ -33,9 +33,27 @@ CREATE TABLE IF NOT EXISTS mission (
 CREATE TABLE IF NOT EXISTS experiment (
     experiment_id INT PRIMARY KEY AUTO_INCREMENT,
     title VARCHAR(255) NOT NULL,
-    status VARCHAR(100) NOT NULL,
+    status ENUM('Planned', 'In Progress', 'On Hold', 'Completed', 'Cancelled') NOT NULL DEFAULT 'Planned',
     crew_id INT NOT NULL,
-    FOREIGN KEY (crew_id) REFERENCES crew(crew_id) ON DELETE CASCADE
+    FOREIGN KEY (crew_id) REFERENCES crew(crew_id) ON DELETE CASCADE,
+    INDEX idx_experiment_status (status, crew_id)
+);
+
+-- =====================================================
+-- Table: change_history
+-- Append-only field diffs for missions and experiments.
+-- No foreign keys: history outlives deleted rows.
+-- =====================================================
+CREATE TABLE IF NOT EXISTS change_history (
+    change_id BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
+    entity ENUM('mission', 'experiment') NOT NULL,
+    entity_id INT NOT NULL,
+    action ENUM('create', 'update', 'delete') NOT NULL,
+    crew_id INT NULL,
+    changes JSON NOT NULL,
+    changed_at DATETIME(3) NOT NULL,
+    INDEX idx_history_entity (entity, entity_id, changed_at),
+    INDEX idx_history_changed_at (changed_at)
 );
 
 -- =====================================================
@@ -97,6 +115,11 @@ SELECT
 FROM experiment e
 INNER JOIN crew c ON e.crew_id = c.crew_id;
 
+-- Experiments per status (served from idx_experiment_status)
+SELECT status, COUNT(*) AS count
+FROM experiment
+GROUP BY status;
+
 -- Count statistics
 SELECT 
     'Total Crew Members' as metric, 
@@ -0,0 +1,56 @@
+"""
+Bulk import command for Space Station Management System.
+
+Loads crew, missions or experiments from a CSV or NDJSON file in chunks
+and prints progress and a summary of rejected rows.
+
+Usage:
+    python import_data.py crew crew.csv
+    python import_data.py mission missions.ndjson --chunk-size 5000
+"""
+
+import argparse
+import sys
+
+from api import importer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import CSV or NDJSON data")
+    parser.add_argument("entity", choices=list(importer.ENTITIES), help="Type of record to import")
+    parser.add_argument("path", help="Path to the CSV or NDJSON file")
+    parser.add_argument("--format", choices=importer.FORMATS, help="File format (default: from extension)")
+    parser.add_argument("--chunk-size", type=int, default=importer.DEFAULT_CHUNK_SIZE, help="Rows per INSERT")
+    args = parser.parse_args()
+
+    fmt = args.format or importer.detect_format(args.path)
+
+    def progress(report):
+        print(
+            f"\r📦 {report.rows_read:,} read | {report.rows_inserted:,} inserted | "
+            f"{report.rows_rejected:,} rejected | {report.elapsed_seconds:.1f}s",
+            end="",
+            flush=True
+        )
+
+    print(f"🚀 Importing {args.entity} records from {args.path} ({fmt})")
+
+    with open(args.path, encoding="utf-8-sig", newline="") as stream:
+        report = importer.import_stream(args.entity, stream, fmt, args.chunk_size, progress)
+
+    print()
+    rate = report.rows_inserted / report.elapsed_seconds if report.elapsed_seconds else 0
+    print(f"✅ Done in {report.elapsed_seconds:.1f}s ({rate:,.0f} rows/s)")
+    print(f"   Inserted: {report.rows_inserted:,}")
+    print(f"   Rejected: {report.rows_rejected:,}")
+
+    for error in report.errors:
+        print(f"   line {error.line}: {error.error}")
+    if report.rows_rejected > len(report.errors):
+        print(f"   ... and {report.rows_rejected - len(report.errors):,} more")
+
+    return 1 if report.rows_rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
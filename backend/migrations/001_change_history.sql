@@ -0,0 +1,16 @@
+-- Migration 001: append-only change history for missions and experiments
+-- Run once against an existing space_station_db database
+
+USE space_station_db;
+
+CREATE TABLE IF NOT EXISTS change_history (
+    change_id BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
+    entity ENUM('mission', 'experiment') NOT NULL,
+    entity_id INT NOT NULL,
+    action ENUM('create', 'update', 'delete') NOT NULL,
+    crew_id INT NULL,
+    changes JSON NOT NULL,
+    changed_at DATETIME(3) NOT NULL,
+    INDEX idx_history_entity (entity, entity_id, changed_at),
+    INDEX idx_history_changed_at (changed_at)
+);
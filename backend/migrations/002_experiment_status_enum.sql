@@ -0,0 +1,37 @@
+-- Migration 002: store experiment.status as an ENUM with a status index
+-- Run once against an existing space_station_db database
+--
+-- Values must match api.models.ExperimentStatus. Existing free-text
+-- values are mapped case-insensitively to the closest status; anything
+-- unrecognised or NULL becomes 'Planned'. Review those rows with the first query
+-- before running the conversion.
+
+USE space_station_db;
+
+-- Rows whose status will fall back to 'Planned' (including NULL statuses)
+SELECT experiment_id, title, status
+FROM experiment
+WHERE status IS NULL OR LOWER(TRIM(status)) NOT IN (
+    'planned', 'pending', 'scheduled', 'not started',
+    'in progress', 'in-progress', 'active', 'ongoing', 'running',
+    'on hold', 'on-hold', 'paused', 'suspended',
+    'completed', 'complete', 'done', 'finished',
+    'cancelled', 'canceled', 'aborted'
+);
+
+-- Normalise existing values to the canonical spelling
+UPDATE experiment
+SET status = CASE
+    WHEN LOWER(TRIM(status)) IN ('in progress', 'in-progress', 'active', 'ongoing', 'running') THEN 'In Progress'
+    WHEN LOWER(TRIM(status)) IN ('on hold', 'on-hold', 'paused', 'suspended') THEN 'On Hold'
+    WHEN LOWER(TRIM(status)) IN ('completed', 'complete', 'done', 'finished') THEN 'Completed'
+    WHEN LOWER(TRIM(status)) IN ('cancelled', 'canceled', 'aborted') THEN 'Cancelled'
+    ELSE 'Planned'
+END
+WHERE experiment_id > 0;
+
+-- 1-byte ENUM instead of VARCHAR(100), plus a compact index for status
+-- filters and per-status counts
+ALTER TABLE experiment
+    MODIFY status ENUM('Planned', 'In Progress', 'On Hold', 'Completed', 'Cancelled') NOT NULL DEFAULT 'Planned',
+    ADD INDEX idx_experiment_status (status, crew_id);
@@ -0,0 +1,258 @@
+"""
+Production server for Space Station Management System API.
+
+Starts a supervisor that runs one uvicorn worker per CPU (or
+WEB_CONCURRENCY workers) on a shared listening socket. Each worker
+creates its own database connection pool on first use, sized so that
+the pools of all workers together stay below MySQL's max_connections
+and each pool fits the threads of one worker that use the database.
+
+Signals:
+    SIGTERM / SIGINT  Drain in-flight requests and stop all workers
+    SIGHUP            Rolling restart: replace workers one at a time
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import signal
+import time
+from dotenv import load_dotenv
+
+import uvicorn
+
+# Load environment variables
+load_dotenv()
+
+# mysql-connector refuses pools larger than this
+MAX_POOL_SIZE = 32
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+RESERVED_CONNECTIONS = int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+
+# Connections one worker can hold at once: the event loop, the crew
+# loader, the write-behind and change-history threads, plus one per
+# scheduler job thread
+MIN_POOL_SIZE = min(4 + int(os.getenv("SCHEDULER_WORKERS") or 2), MAX_POOL_SIZE)
+
+
+def detect_max_connections() -> int:
+    """
+    Determine MySQL's max_connections.
+
+    Uses MYSQL_MAX_CONNECTIONS when set, otherwise asks the server and
+    falls back to the MySQL default of 151.
+
+    Returns:
+        int: Maximum number of server connections
+    """
+    configured = os.getenv("MYSQL_MAX_CONNECTIONS")
+    if configured:
+        return int(configured)
+
+    try:
+        import mysql.connector
+
+        connection = mysql.connector.connect(
+            host=os.getenv("DB_HOST", "localhost"),
+            user=os.getenv("DB_USER", "root"),
+            password=os.getenv("DB_PASSWORD", ""),
+            database=os.getenv("DB_NAME", "space_station_db"),
+            connection_timeout=5
+        )
+        cursor = connection.cursor()
+        cursor.execute("SELECT @@max_connections")
+        (max_connections,) = cursor.fetchone()
+        cursor.close()
+        connection.close()
+        return int(max_connections)
+    except Exception as e:
+        print(f"⚠️  Could not read max_connections from MySQL ({e}), assuming 151")
+        return 151
+
+
+def plan_concurrency() -> dict:
+    """
+    Work out worker count and per-worker pool size.
+
+    Returns:
+        dict: Effective concurrency budget
+    """
+    max_connections = detect_max_connections()
+    budget = max(1, max_connections - RESERVED_CONNECTIONS)
+
+    warnings = []
+
+    requested = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+    # Fewer workers rather than pools too small for one worker's threads
+    workers = max(1, min(requested, budget // MIN_POOL_SIZE))
+    if workers < requested:
+        warnings.append(
+            f"Running {workers} of {requested} workers so each pool has at least "
+            f"{MIN_POOL_SIZE} connections (budget {budget})"
+        )
+
+    pool_size = int(os.getenv("DB_POOL_SIZE") or budget // workers)
+    pool_size = max(MIN_POOL_SIZE, min(pool_size, budget // workers, MAX_POOL_SIZE))
+    if pool_size > budget:
+        pool_size = budget
+        warnings.append(
+            f"Connection budget {budget} is below the {MIN_POOL_SIZE} connections one worker "
+            f"can use at once; requests will wait up to DB_POOL_TIMEOUT for a connection"
+        )
+
+    return {
+        "workers": workers,
+        "pool_size": pool_size,
+        "max_connections": max_connections,
+        "budget": budget,
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "warnings": warnings,
+    }
+
+
+def check_read_model(workers: int):
+    """
+    Turn the in-memory read model off when running several workers.
+
+    Each worker keeps its own copy, which only sees that worker's writes
+    until the next consistency check, so other workers would serve stale
+    rows for up to READ_MODEL_CHECK_INTERVAL seconds.
+    """
+    if workers > 1 and os.getenv("READ_MODEL_ENABLED", "false").lower() == "true":
+        print(f"⚠️  READ_MODEL_ENABLED is ignored with {workers} workers: "
+              "each worker's copy would miss the others' writes. Set WEB_CONCURRENCY=1 to use it.")
+        os.environ["READ_MODEL_ENABLED"] = "false"
+
+
+def print_summary(plan: dict):
+    """Print the effective concurrency budget."""
+    total = plan["workers"] * plan["pool_size"]
+    print("🚀 Starting Space Station Management System API (production)")
+    print(f"   Listening:        http://{HOST}:{PORT}")
+    print(f"   Workers:          {plan['workers']}")
+    print(f"   Pool per worker:  {plan['pool_size']}")
+    print(f"   DB connections:   {total} of {plan['max_connections']} "
+          f"({RESERVED_CONNECTIONS} reserved, budget {plan['budget']})")
+    print(f"   Event loop:       {plan['loop']}")
+    print(f"   HTTP parser:      {plan['http']}")
+    print(f"   Graceful timeout: {GRACEFUL_TIMEOUT}s")
+    for warning in plan["warnings"]:
+        print(f"⚠️  {warning}")
+    print()
+
+
+def run_worker(config: uvicorn.Config, sockets: list):
+    """Worker process entry point: serve on the inherited sockets."""
+    server = uvicorn.Server(config)
+    server.run(sockets=sockets)
+
+
+class Supervisor:
+    """Starts, monitors, restarts and drains worker processes."""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.sockets = [config.bind_socket()]
+        self.processes = []
+        self.context = multiprocessing.get_context("spawn")
+        self.should_exit = False
+        self.should_reload = False
+
+    def spawn(self):
+        """Start one worker process."""
+        process = self.context.Process(
+            target=run_worker,
+            kwargs={"config": self.config, "sockets": self.sockets},
+            daemon=False
+        )
+        process.start()
+        return process
+
+    def stop(self, process):
+        """Ask a worker to drain, and kill it if it does not stop in time."""
+        if process.is_alive():
+            process.terminate()
+        process.join(GRACEFUL_TIMEOUT + 5)
+        if process.is_alive():
+            print(f"⚠️  Worker {process.pid} did not drain in time, killing it")
+            process.kill()
+            process.join()
+
+    def rolling_restart(self):
+        """Replace workers one at a time so the socket is never left unserved."""
+        print("🔄 Rolling restart of workers")
+        for index, old in enumerate(list(self.processes)):
+            self.processes[index] = self.spawn()
+            self.stop(old)
+
+    def handle_exit(self, sig, frame):
+        self.should_exit = True
+
+    def handle_reload(self, sig, frame):
+        self.should_reload = True
+
+    def run(self):
+        """Run the supervisor loop until asked to exit."""
+        signal.signal(signal.SIGINT, self.handle_exit)
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self.handle_reload)
+
+        self.processes = [self.spawn() for _ in range(self.workers)]
+
+        while not self.should_exit:
+            time.sleep(0.5)
+
+            if self.should_reload:
+                self.should_reload = False
+                self.rolling_restart()
+                continue
+
+            # Replace workers that died unexpectedly
+            for index, process in enumerate(self.processes):
+                if not process.is_alive() and not self.should_exit:
+                    print(f"⚠️  Worker {process.pid} exited with code {process.exitcode}, restarting")
+                    self.processes[index] = self.spawn()
+
+        print("🛑 Draining workers...")
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            self.stop(process)
+
+        for sock in self.sockets:
+            sock.close()
+
+
+if __name__ == "__main__":
+    # Check if database credentials are configured
+    if not os.getenv("DB_HOST"):
+        print("⚠️  WARNING: Database environment variables not configured!")
+        print("📝 Please create a .env file based on .env.example")
+        print()
+
+    plan = plan_concurrency()
+
+    # Workers read the pool size when api.database is first imported
+    os.environ["DB_POOL_SIZE"] = str(plan["pool_size"])
+    check_read_model(plan["workers"])
+
+    config = uvicorn.Config(
+        "api.index:app",
+        host=HOST,
+        port=PORT,
+        loop="uvloop" if plan["loop"] == "uvloop" else "asyncio",
+        http="httptools" if plan["http"] == "httptools" else "h11",
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        log_level="info"
+    )
+
+    print_summary(plan)
+    Supervisor(config, plan["workers"]).run()
@@ -0,0 +1,91 @@
+"""
+Tests for malformed rows in api.importer.import_stream.
+
+The database is replaced with a fake execute_query, so these run without MySQL.
+"""
+
+import io
+
+import pytest
+
+from api import importer
+
+
+@pytest.fixture
+def inserts(monkeypatch):
+    """Record INSERT parameters and report crew 1 and 2 as existing."""
+    executed = []
+
+    def fake_execute_query(query, params=None, fetch="all", prepare=True):
+        if query.startswith("SELECT crew_id FROM crew"):
+            return [{"crew_id": 1}, {"crew_id": 2}]
+        executed.append(params)
+        return None
+
+    monkeypatch.setattr(importer, "execute_query", fake_execute_query)
+    return executed
+
+
+def test_csv_row_with_extra_fields_is_rejected(inserts):
+    stream = io.StringIO(
+        "title,status,crew_id\n"
+        "Plant Growth,Planned,1\n"
+        "Fluid Study,Planned,2,surplus\n"
+        "Bone Density,In Progress,2\n",
+        newline=""
+    )
+
+    report = importer.import_stream("experiment", stream, "csv")
+
+    assert report.rows_read == 3
+    assert report.rows_inserted == 2
+    assert report.rows_rejected == 1
+    assert report.errors[0].line == 3
+    assert "more fields than the header" in report.errors[0].error
+    assert len(inserts) == 1
+
+
+def test_ndjson_non_object_and_invalid_json_are_rejected(inserts):
+    stream = io.StringIO(
+        '{"title": "Plant Growth", "status": "Planned", "crew_id": 1}\n'
+        '[1, 2, 3]\n'
+        '"just a string"\n'
+        '{"title": "broken"\n'
+    )
+
+    report = importer.import_stream("experiment", stream, "ndjson")
+
+    assert report.rows_inserted == 1
+    assert report.rows_rejected == 3
+    assert [error.line for error in report.errors] == [2, 3, 4]
+    assert report.errors[0].error == "Expected a JSON object"
+    assert report.errors[2].error.startswith("Invalid JSON")
+
+
+def test_bad_integers_and_unknown_crew_are_rejected(inserts):
+    stream = io.StringIO(
+        "name,purpose,crew_id\n"
+        "Satellite Repair,Fix antenna,two\n"
+        "Moon Base,Survey site,99\n"
+        "Spacewalk,EVA training,1\n",
+        newline=""
+    )
+
+    report = importer.import_stream("mission", stream, "csv")
+
+    assert report.rows_inserted == 1
+    assert report.rows_rejected == 2
+    assert report.errors[0].line == 2
+    assert report.errors[0].error.startswith("crew_id:")
+    assert report.errors[1].error == "Crew member with ID 99 not found"
+
+
+def test_invalid_status_is_rejected(inserts):
+    stream = io.StringIO('{"title": "Plant Growth", "status": "Done", "crew_id": 1}\n')
+
+    report = importer.import_stream("experiment", stream, "ndjson")
+
+    assert report.rows_inserted == 0
+    assert report.rows_rejected == 1
+    assert report.errors[0].error.startswith("status:")
+    assert inserts == []
@@ -0,0 +1,68 @@
+"""
+Tests for api.rate_limit.RateLimitMiddleware.
+
+The middleware wraps a stub app that counts the requests it receives, so
+these run without the real routes or a database.
+"""
+
+import pytest
+from starlette.responses import PlainTextResponse
+from starlette.testclient import TestClient
+
+from api import rate_limit
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client for a stub app limited by POST /login=3/minute:crew."""
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "_rules", rate_limit.parse_rules("POST /login=3/minute:crew"))
+    monkeypatch.setattr(rate_limit, "_backend", rate_limit.MemoryBackend())
+
+    async def app(scope, receive, send):
+        # Drain the (possibly replayed) body like a real route would
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    return TestClient(rate_limit.RateLimitMiddleware(app))
+
+
+def statuses(client, bodies):
+    return [client.post("/login", json=body).status_code for body in bodies]
+
+
+def test_crew_key_is_limited_per_crew(client):
+    assert statuses(client, [{"crew_id": 1}] * 4) == [200, 200, 200, 429]
+    assert statuses(client, [{"crew_id": 2}]) == [200]
+
+
+def test_crew_id_is_coerced_like_the_request_model(client):
+    bodies = [{"crew_id": 1}, {"crew_id": "1"}, {"crew_id": 1.0}, {"crew_id": "1"}]
+
+    assert statuses(client, bodies) == [200, 200, 200, 429]
+
+
+def test_missing_or_invalid_crew_id_falls_back_to_client_ip(client):
+    bodies = [{"password": "x"}, {"crew_id": "one"}, {"crew_id": 1.5}, {"crew_id": None}]
+
+    assert statuses(client, bodies) == [200, 200, 200, 429]
+    # The crew bucket itself is untouched
+    assert statuses(client, [{"crew_id": 1}]) == [200]
+
+
+def test_oversized_body_falls_back_to_client_ip(client):
+    body = {"crew_id": 1, "padding": "x" * rate_limit.MAX_BODY_BYTES}
+
+    assert statuses(client, [body] * 4) == [200, 200, 200, 429]
+
+
+def test_rejected_request_has_retry_after(client):
+    statuses(client, [{"crew_id": 1}] * 3)
+
+    response = client.post("/login", json={"crew_id": 1})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1